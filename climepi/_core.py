@@ -4,6 +4,9 @@ Core module for the climepi package.
 Contains the ClimEpiDatasetAccessor class for xarray datasets.
 """
 
+import functools
+
+import cartopy.crs as ccrs
 import geoviews.feature as gf
 import holoviews as hv
 import hvplot.xarray  # noqa # pylint: disable=unused-import
@@ -317,15 +320,14 @@ class ClimEpiDatasetAccessor:
                 uncertainty_level=uncertainty_level,
                 estimate_internal_variability=False,
             )
-        # Compute ensemble statistics
+        # Compute ensemble statistics (for dask-backed data, the realization dimension
+        # needs to be contained in a single chunk for the quantile method, with the
+        # other dimensions split automatically to keep chunk sizes manageable)
         ds_raw = self._obj[data_var_list]  # drops bounds for now (re-add at end)
-        # if ds_raw.chunks:
-        #     # Currently need to explicitly rechunk along the realization dimension for
-        #     # the quantile method to work [may be fixed in dask 2024.11 - check
-        #     # lens2_2030_2060_2090 notebook to see if safe to remove this, since
-        #     # only rechunking before quantile method could be problematic with map
-        #     # plots]
-        #     ds_raw = ds_raw.chunk({"realization": -1})
+        if ds_raw.chunks:
+            ds_raw = ds_raw.chunk(
+                {dim: -1 if dim == "realization" else "auto" for dim in ds_raw.dims}
+            )
         ds_mean = ds_raw.mean(dim="realization").expand_dims(
             dim={"stat": ["mean"]}, axis=-1
         )
@@ -741,11 +743,16 @@ class ClimEpiDatasetAccessor:
         """
         data_var = self._process_data_var_argument(data_var)
         da_plot = self._obj[data_var].squeeze()
+        # Data are assumed to be on a (PlateCarree) lon/lat grid. Unless a different
+        # CRS, projection or tile source is specified, the map is drawn in the same CRS,
+        # so skip the (identity) reprojection of the grid.
+        project = any(kwargs.get(key) for key in ["crs", "projection", "tiles"])
         kwargs_hvplot = {
             "x": "lon",
             "y": "lat",
             "cmap": "viridis",
-            "project": True,
+            "crs": _get_plate_carree_crs(),
+            "project": project,
             "geo": True,
             "rasterize": True,
             "coastline": True,
@@ -998,3 +1005,10 @@ class ClimEpiDatasetAccessor:
             """Multiple data variables present. The data variable to use must be
             specified."""
         )
+
+
+@functools.lru_cache(maxsize=None)
+def _get_plate_carree_crs():
+    # Cached since constructing cartopy CRS objects is relatively slow, and the same
+    # (lon/lat) CRS is used for every map plot.
+    return ccrs.PlateCarree()
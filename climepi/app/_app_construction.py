@@ -1,8 +1,11 @@
 """Module defining the layout of the climepi app and providing a method to run it."""
 
+import asyncio
 import logging
+import shutil
 import signal
 import sys
+import weakref
 
 import panel as pn
 from dask.distributed import Client
@@ -67,9 +70,15 @@ def run_app(
             enable_custom_epi_model=enable_custom_epi_model,
         )
 
+    # Defer evaluating the (parameter-dependent) views until the page has loaded, with
+    # loading indicators shown in the meantime, so that the page layout is sent to the
+    # browser without waiting for the initial plots to be generated
+    pn.config.defer_load = True
+    pn.config.loading_indicator = True
+
     server = pn.serve({"/climepi_app": session}, start=False, **kwargs)
 
-    _set_shutdown()
+    _set_shutdown(server)
 
     logger.info("Set-up complete. Press Ctrl+C to stop the app")
 
@@ -138,13 +147,23 @@ def _session(
         enable_custom_epi_model=enable_custom_epi_model,
     )
 
+    # Controllers are only weakly referenced in the cache (the session's template keeps
+    # the controller alive via its views), so that they can be garbage collected even
+    # if a session destroyed callback is missed
+
     session_id = pn.state.curdoc.session_context.id
-    pn.state.cache["controllers"] = {
-        **pn.state.cache.get("controllers", {}),
-        session_id: controller,
-    }
+    controllers = pn.state.cache.setdefault(
+        "controllers", weakref.WeakValueDictionary()
+    )
+    controllers[session_id] = controller
 
-    # Ensure temp files are cleaned up both when a session is closed
+    # Ensure temp files are cleaned up both when a session is closed, and (in case the
+    # session destroyed callback is missed) when the controller is garbage collected or
+    # the app is stopped. The finalizer must not reference the controller itself.
+
+    weakref.finalize(
+        controller, shutil.rmtree, controller._ds_epi_path.parent, ignore_errors=True
+    )
 
     def _cleanup_session(session_context):
         _session_destroyed(session_id=session_context.id)
@@ -180,11 +199,14 @@ def _layout(
     epi_model_plot_view = controller.epi_model_plot_view
     epi_plot_view = controller.epi_plot_view
 
+    # Use dynamic tabs so that only the contents of the active tab are rendered
+
     template.main.append(
         pn.Tabs(
             ("Climate data", pn.Row(clim_plot_controls, clim_plot_view)),
             ("Epidemiological model", pn.Row(epi_model_plot_view)),
             ("Epidemiological projections", pn.Row(epi_plot_controls, epi_plot_view)),
+            dynamic=True,
         )
     )
 
@@ -192,29 +214,77 @@ def _layout(
 
 
 def _session_destroyed(session_id):
-    # Clean up the session
-    controller = pn.state.cache["controllers"].pop(session_id)
+    # Clean up the session (unless the controller has already been garbage collected)
+    controller = pn.state.cache.get("controllers", {}).pop(session_id, None)
+    if controller is None:
+        return
     controller.cleanup_temp_file()
     logger = get_logger(name="session")
     logger.info("Session cleaned up successfully (deleted temporary file(s))")
 
 
-def _set_shutdown():
-    original_sigint = signal.getsignal(signal.SIGINT)
-
-    def _sigint(signum, frame):
-        logger = get_logger(name="stop")
-        logger.info("Cleaning up sessions")
-        session_ids = list(pn.state.cache["controllers"].keys())
-        for session_id in session_ids:
-            _session_destroyed(session_id=session_id)
-        if "dask_client" in pn.state.cache:
-            logger.info("Closing Dask client")
-            client = pn.state.cache["dask_client"]
-            client.cancel(client.futures, force=True)
-            client.close()
-        logger.info("Stopping app")
-        original_sigint(signum, frame)
-
-    signal.signal(signal.SIGINT, _sigint)
-    signal.signal(signal.SIGTERM, _sigint)
+def _set_shutdown(server):
+    # Register shutdown handlers with the asyncio event loop underlying the server's
+    # IOLoop, so that sessions are cleaned up concurrently (in worker threads) without
+    # blocking the loop, before the server is stopped. The handlers can only be added
+    # once the loop is running, so this is scheduled as a callback. The handlers are
+    # removed when the first signal is received, so that a second signal (e.g., pressing
+    # Ctrl+C again) stops the app immediately if the shutdown gets stuck.
+
+    signums = (signal.SIGINT, signal.SIGTERM)
+    shutdown_tasks = set()
+
+    def _start_shutdown(loop):
+        for signum in signums:
+            try:
+                loop.remove_signal_handler(signum)
+            except NotImplementedError:
+                signal.signal(
+                    signum,
+                    signal.default_int_handler
+                    if signum == signal.SIGINT
+                    else signal.SIG_DFL,
+                )
+        # Keep a reference to the task so that it is not garbage collected mid-run
+        task = loop.create_task(_shutdown(server))
+        shutdown_tasks.add(task)
+        task.add_done_callback(shutdown_tasks.discard)
+
+    def _add_signal_handlers():
+        loop = asyncio.get_running_loop()
+        for signum in signums:
+            try:
+                loop.add_signal_handler(signum, _start_shutdown, loop)
+            except NotImplementedError:
+                # Event loop signal handlers are not supported on Windows
+                signal.signal(
+                    signum,
+                    lambda *_: loop.call_soon_threadsafe(_start_shutdown, loop),
+                )
+
+    server.io_loop.add_callback(_add_signal_handlers)
+
+
+async def _shutdown(server):
+    logger = get_logger(name="stop")
+    logger.info("Cleaning up sessions")
+    session_ids = list(pn.state.cache.get("controllers", {}).keys())
+    await asyncio.gather(
+        *[
+            asyncio.to_thread(_session_destroyed, session_id=session_id)
+            for session_id in session_ids
+        ]
+    )
+    if "dask_client" in pn.state.cache:
+        logger.info("Closing Dask client")
+        await asyncio.to_thread(_close_dask_client, pn.state.cache["dask_client"])
+    logger.info("Stopping app")
+    server.stop()
+    server.io_loop.stop()
+
+
+def _close_dask_client(client):
+    # Cancel any running computations and close the client (blocking, so run in a
+    # worker thread during shutdown)
+    client.cancel(client.futures, force=True)
+    client.close()
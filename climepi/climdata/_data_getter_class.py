@@ -287,12 +287,14 @@ class ClimateDataGetter:
 
     def _open_local_data(self, **kwargs):
         # Open the data from the local files (will raise FileNotFoundError if any
-        # files are not found), and store the dataset in the _ds attribute.
+        # files are not found), and store the dataset in the _ds attribute. Files are
+        # opened in parallel (using dask.delayed) since the number of saved files can be
+        # large (e.g., one per scenario/model/realization combination).
         save_dir = self._save_dir
         file_names = self.file_names
         ds = xr.open_mfdataset(
             [save_dir / file_name for file_name in file_names],
-            **{"data_vars": "minimal", "chunks": {}, **kwargs},
+            **{"data_vars": "minimal", "chunks": {}, "parallel": True, **kwargs},
         )
         if "time_bnds" in ds:
             # Load time bounds to avoid errors saving to file (since no encoding set)
@@ -5,10 +5,13 @@ Running this module as a script will create all example datasets by downloading
 formatting the relevant data.
 """
 
+import atexit
+import functools
 import pathlib
 
-import numpy as np
 import pooch
+import requests
+from requests.adapters import HTTPAdapter
 
 from climepi._core import ClimEpiDatasetAccessor  # noqa
 from climepi._version import get_versions
@@ -32,7 +35,7 @@ EXAMPLES = {
         "data_source": "isimip",
         "frequency": "monthly",
         "subset": {
-            "years": np.arange(2030, 2101),
+            "years": range(2030, 2101),
             "locations": [
                 "London",
                 "Los Angeles",
@@ -47,7 +50,7 @@ EXAMPLES = {
         "data_source": "isimip",
         "frequency": "daily",
         "subset": {
-            "years": np.arange(2030, 2101),
+            "years": range(2030, 2101),
             "locations": [
                 "London",
                 "Los Angeles",
@@ -61,7 +64,7 @@ EXAMPLES = {
         "data_source": "lens2",
         "frequency": "monthly",
         "subset": {
-            "years": np.arange(2030, 2101),
+            "years": range(2030, 2101),
             "locations": [
                 "London",
                 "Los Angeles",
@@ -82,7 +85,9 @@ EXAMPLES = {
 EXAMPLE_NAMES = list(EXAMPLES.keys())
 
 
-def get_example_dataset(name, base_dir=None, force_remake=False, **kwargs):
+def get_example_dataset(
+    name, base_dir=None, force_redownload=False, force_remake=False, **kwargs
+):
     """
     Retrieve an example climate dataset.
 
@@ -104,11 +109,12 @@ def get_example_dataset(name, base_dir=None, force_remake=False, **kwargs):
         downloaded to and accessed from a subdirectory of this directory with the same
         name as the `name` argument. If not specified, a directory within the OS cache
         will be used.
-    base_dir : str or pathlib.Path, optional
-        Base directory in which example datasets are stored. The example dataset will be
-        downloaded to and accessed from a subdirectory of this directory with the same
-        name as the `name` argument. If not specified, a directory within the OS cache
-        will be used.
+    force_redownload : bool, optional
+        If True, delete any existing local copies of the formatted dataset files and
+        download them again (default is False, in which case existing files are checked
+        against the registry of file hashes, and only files that are missing or do not
+        match are downloaded). Has no effect if the formatted dataset is not available
+        for direct download, or if `force_remake` is True.
     force_remake : bool, optional
         If True, force the download/formatting of the raw underlying data, even if the
         formatted dataset already exists locally and/or is available for direct
@@ -128,7 +134,9 @@ def get_example_dataset(name, base_dir=None, force_remake=False, **kwargs):
     # If the formatted example dataset is available for direct download, download it
     # if neccessary
     if example_details.get("formatted_data_downloadable", False) and not force_remake:
-        _fetch_formatted_example_dataset(name, data_dir)
+        _fetch_formatted_example_dataset(
+            name, data_dir, force_redownload=force_redownload
+        )
     # Download and format the raw underlying data if neccessary, and return the dataset
     data_source = example_details["data_source"]
     frequency = example_details["frequency"]
@@ -173,16 +181,52 @@ def _get_data_dir(name, base_dir):
     return data_dir
 
 
+@functools.lru_cache(maxsize=1)
 def _get_data_version():
+    # Cached since the version is fixed for a given installation, and parsing it is
+    # relatively expensive.
     version = pooch.check_version(get_versions()["version"], fallback="main")
     if version != "main":
         version = "v" + version
     return version
 
 
-def _fetch_formatted_example_dataset(name, data_dir):
+@functools.lru_cache(maxsize=1)
+def _get_requests_session():
+    # Shared session used for downloading formatted example datasets, so that
+    # connections (and TLS handshakes) are reused across files and examples rather than
+    # being set up for every download. Closed when the interpreter exits.
+    session = requests.Session()
+    session.mount(
+        "https://",
+        HTTPAdapter(pool_connections=8, pool_maxsize=16, max_retries=3),
+    )
+    atexit.register(session.close)
+    return session
+
+
+def _download_with_shared_session(url, output_file, pup):
+    # Downloader for pooch (see the pooch.HTTPDownloader docs for the call signature)
+    # that streams the file using the shared requests session.
+    response = _get_requests_session().get(url, stream=True, timeout=60)
+    response.raise_for_status()
+    ispath = not hasattr(output_file, "write")
+    if ispath:
+        output_file = open(output_file, "w+b")
+    try:
+        for chunk in response.iter_content(chunk_size=1024 * 1024):
+            if chunk:
+                output_file.write(chunk)
+    finally:
+        if ispath:
+            output_file.close()
+
+
+def _fetch_formatted_example_dataset(name, data_dir, force_redownload=False):
     # Helper function for fetching the formatted example dataset if available for direct
-    # download.
+    # download. Pooch checks the hash of each existing file against the registry and
+    # only downloads files that are missing or do not match (if force_redownload is
+    # True, existing files are deleted first so that all files are downloaded again).
     example_details = _get_example_details(name)
     data_source = example_details["data_source"]
     frequency = example_details["frequency"]
@@ -192,6 +236,9 @@ def _fetch_formatted_example_dataset(name, data_dir):
         frequency=frequency,
         subset=subset,
     )
+    if force_redownload:
+        for file_name in file_names:
+            (pathlib.Path(data_dir) / file_name).unlink(missing_ok=True)
     version = _get_data_version()
     url = (
         "https://github.com/will-s-hart/climate-epidemics/raw/"
@@ -204,9 +251,13 @@ def _fetch_formatted_example_dataset(name, data_dir):
     )
     registry_file_path = _get_registry_file_path(name)
     pup.load_registry(registry_file_path)
-    _ = [pup.fetch(file_name) for file_name in file_names]
+    _ = [
+        pup.fetch(file_name, downloader=_download_with_shared_session)
+        for file_name in file_names
+    ]
 
 
+@functools.lru_cache(maxsize=None)
 def _get_registry_file_path(name):
     # Helper function for getting the path to the registry file for the example dataset.
     return pathlib.Path(__file__).parent / "_example_registry_files" / f"{name}.txt"
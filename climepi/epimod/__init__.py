@@ -7,4 +7,5 @@ from climepi.epimod._examples import (  # noqa
 from climepi.epimod._model_classes import (  # noqa
     EpiModel,
     SuitabilityModel,
+    suitability_1d,
 )
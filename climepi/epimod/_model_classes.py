@@ -6,6 +6,7 @@ rainfall-dependent suitability models.
 
 import numpy as np
 import xarray as xr
+from scipy.ndimage import map_coordinates
 
 from climepi.utils import add_bnds_from_other
 
@@ -57,6 +58,9 @@ class SuitabilityModel(EpiModel):
         A dataset containing suitability values defined for different temperature
         values or temperature/precipitation combinations. Only defined if the parameter
         `suitability_table` is provided.
+    interp_order : int
+        The order of the interpolation used for suitability tables defined in terms of
+        both temperature and precipitation (0 for nearest neighbour or 1 for bilinear).
 
     Parameters
     ----------
@@ -74,17 +78,31 @@ class SuitabilityModel(EpiModel):
         linear interpolation is used to calculate suitability values away from grid
         points. If suitability only depends on both tempperature and precipitation,
         equi-spaced temperature and precipitation values should be provided (this is not
-        required if suitability only depends on temperature), and nearest neighbour
-        interpolation is used to calculate suitability values away from grid points
-        (this is for performance reasons). Suitability values can be either binary (0
-        or 1) or continuous. Suitability is assumed to take the nearest endpoint value
+        required if suitability only depends on temperature), and either nearest
+        neighbour or bilinear interpolation is used to calculate suitability values away
+        from grid points (see `interp_order`). Suitability values can be either binary
+        (0 or 1) or continuous. To reduce memory usage, suitability values are returned
+        as 8-bit unsigned integers for binary temperature/precipitation tables with
+        nearest neighbour interpolation (where values are looked up rather than
+        interpolated), and as single-precision floats otherwise (including for binary
+        temperature-only tables, since linear interpolation between 0 and 1 gives
+        non-binary values). Suitability is assumed to take the nearest endpoint value
         for temperature and/or precipitation values outside the provided range(s).
         Default is None. Only one of `temperature_range` and `suitability_table` should
         be provided.
+    interp_order : int, optional
+        The order of the interpolation used to calculate suitability values away from
+        grid points if `suitability_table` depends on both temperature and
+        precipitation. Should be 0 (nearest neighbour interpolation) or 1 (bilinear
+        interpolation). Default is 0. Has no effect for temperature-only suitability
+        tables, for which linear interpolation is always used.
     """
 
-    def __init__(self, temperature_range=None, suitability_table=None):
+    def __init__(self, temperature_range=None, suitability_table=None, interp_order=0):
         super().__init__()
+        if interp_order not in (0, 1):
+            raise ValueError("The interp_order argument should be either 0 or 1.")
+        self.interp_order = interp_order
         if suitability_table is None:
             self.temperature_range = temperature_range
             self.suitability_table = None
@@ -114,6 +132,7 @@ class SuitabilityModel(EpiModel):
             )
             self._suitability_var_name = suitability_var_name
             self._suitability_var_long_name = suitability_var_long_name
+            self._set_table_metadata()
 
     def run(self, ds_clim, return_months_suitable=False, suitability_threshold=0):
         """
@@ -155,7 +174,8 @@ class SuitabilityModel(EpiModel):
             ds_epi[suitability_var_name].attrs["long_name"] = (
                 self._suitability_var_long_name
             )
-        ds_epi = add_bnds_from_other(ds_epi, ds_clim)
+        if any(bnd_var in ds_clim for bnd_var in ["lat_bnds", "lon_bnds", "time_bnds"]):
+            ds_epi = add_bnds_from_other(ds_epi, ds_clim)
         if return_months_suitable:
             ds_epi = ds_epi.climepi.months_suitable(
                 suitability_threshold=suitability_threshold
@@ -223,12 +243,68 @@ class SuitabilityModel(EpiModel):
             return 1
         return self.suitability_table[self._suitability_var_name].max().item()
 
+    def _set_table_metadata(self):
+        # Extract the table values and grid information needed to run the model from
+        # the suitability table once on initialisation, rather than on each run.
+        suitability_table = self.suitability_table
+        if "temperature" not in suitability_table.dims:
+            return
+        table_temp_vals = np.ascontiguousarray(suitability_table["temperature"].values)
+        if "precipitation" not in suitability_table.dims:
+            self._table_temp_vals = table_temp_vals
+            self._table_values = np.ascontiguousarray(
+                suitability_table[self._suitability_var_name].values
+            )
+            # If temperature values are equi-spaced, a faster interpolation method can
+            # be used when running the model
+            self._table_temp_delta = _get_grid_spacing(table_temp_vals, rtol=1e-9)
+            return
+        table_precip_vals = suitability_table["precipitation"].values
+        table_temp_delta = _get_grid_spacing(table_temp_vals, rtol=1e-3)
+        table_precip_delta = _get_grid_spacing(table_precip_vals, rtol=1e-3)
+        if table_temp_delta is None or table_precip_delta is None:
+            raise ValueError(
+                "The suitability table must be defined on a regular grid of "
+                "temperature and precipitation values."
+            )
+        table_values = (
+            suitability_table[self._suitability_var_name]
+            .transpose("temperature", "precipitation")
+            .values
+        )
+        if self.interp_order == 0 and np.isin(table_values, [0, 1]).all():
+            # Binary suitability table (values are looked up, not interpolated)
+            table_values_dtype = np.uint8
+        else:
+            table_values_dtype = np.float32
+        self._table_values = np.ascontiguousarray(
+            table_values, dtype=table_values_dtype
+        )
+        self._table_temp_grid = (
+            table_temp_vals[0],
+            table_temp_delta,
+            len(table_temp_vals),
+        )
+        self._table_precip_grid = (
+            table_precip_vals[0],
+            table_precip_delta,
+            len(table_precip_vals),
+        )
+
     def _run_main_temp_range(self, ds_clim):
         # Run the main logic of a suitability model defined by a temperature range.
         temperature = ds_clim["temperature"]
-        temperature_range = self.temperature_range
-        da_suitability = (temperature >= temperature_range[0]) & (
-            temperature <= temperature_range[1]
+        temperature_min, temperature_max = self.temperature_range
+
+        def suitability_func(temperature_curr):
+            # Combine the comparisons in place on each chunk to avoid allocating an
+            # extra full-size boolean array.
+            suitability_curr = np.greater_equal(temperature_curr, temperature_min)
+            suitability_curr &= temperature_curr <= temperature_max
+            return suitability_curr
+
+        da_suitability = xr.apply_ufunc(
+            suitability_func, temperature, dask="parallelized", output_dtypes=[bool]
         )
         return da_suitability
 
@@ -236,23 +312,22 @@ class SuitabilityModel(EpiModel):
         # Run the main logic of a suitability model defined by a temperature suitability
         # table.
         temperature = ds_clim["temperature"]
-        suitability_table = self.suitability_table
-        table_temp_vals = suitability_table["temperature"].values
-        suitability_var_name = self._suitability_var_name
-        table_suitability_vals = suitability_table[suitability_var_name].values
+        table_temp_vals = self._table_temp_vals
+        table_temp_delta = self._table_temp_delta
+        table_values = self._table_values
 
         def suitability_func(temperature_curr):
-            suitability_curr = np.interp(
-                temperature_curr,
-                table_temp_vals,
-                table_suitability_vals,
+            return _suitability_1d(
+                temperature_curr, table_temp_vals, table_values, table_temp_delta
             )
-            return suitability_curr
 
         da_suitability = xr.apply_ufunc(
-            suitability_func, temperature, dask="parallelized"
+            suitability_func,
+            temperature,
+            dask="parallelized",
+            output_dtypes=[np.float32],
         )
-        da_suitability.attrs = suitability_table[suitability_var_name].attrs
+        da_suitability.attrs = self.suitability_table[self._suitability_var_name].attrs
         return da_suitability
 
     def _run_main_temp_precip_table(self, ds_clim):
@@ -260,41 +335,152 @@ class SuitabilityModel(EpiModel):
         # precipitation suitability table.
         temperature = ds_clim["temperature"]
         precipitation = ds_clim["precipitation"]
-        suitability_table = self.suitability_table
-        suitability_var_name = self._suitability_var_name
-        table_values = (
-            suitability_table[suitability_var_name]
-            .transpose("temperature", "precipitation")
-            .values
-        )
-        table_temp_vals = suitability_table["temperature"].values
-        table_temp_deltas = np.diff(table_temp_vals)
-        table_precip_vals = suitability_table["precipitation"].values
-        table_precip_deltas = np.diff(table_precip_vals)
-        if not np.all(
-            np.isclose(table_temp_deltas, table_temp_deltas[0], rtol=1e-3, atol=0)
-        ) or not np.all(
-            np.isclose(table_precip_deltas, table_precip_deltas[0], rtol=1e-3, atol=0)
-        ):
-            raise ValueError(
-                "The suitability table must be defined on a regular grid of ",
-                "temperature and precipitation values.",
-            )
-        table_temp_delta = table_temp_deltas[0]
-        table_precip_delta = table_precip_deltas[0]
-
-        temp_inds = (temperature - table_temp_vals[0]) / table_temp_delta
-        temp_inds = temp_inds.round(0).astype(int).clip(0, len(table_temp_vals) - 1)
-        precip_inds = (precipitation - table_precip_vals[0]) / table_precip_delta
-        precip_inds = (
-            precip_inds.round(0).astype(int).clip(0, len(table_precip_vals) - 1)
-        )
-
-        def suitability_func(temp_inds_curr, precip_inds_curr):
+        table_values = self._table_values
+        table_temp_grid = self._table_temp_grid
+        table_precip_grid = self._table_precip_grid
+        interp_order = self.interp_order
+
+        def suitability_func(temperature_curr, precipitation_curr):
+            # Compute the nearest grid indices and look up the suitability values in a
+            # single pass over each chunk (avoiding creating intermediate index arrays
+            # for the full dataset).
+            temp_inds_curr = _get_nearest_inds(temperature_curr, *table_temp_grid)
+            precip_inds_curr = _get_nearest_inds(precipitation_curr, *table_precip_grid)
             suitability_curr = table_values[temp_inds_curr, precip_inds_curr]
             return suitability_curr
 
-        da_suitability = xr.apply_ufunc(
-            suitability_func, temp_inds, precip_inds, dask="parallelized"
-        )
+        def suitability_func_bilinear(temperature_curr, precipitation_curr):
+            # Bilinear interpolation on the (regular) table grid, with values outside
+            # the grid taking the nearest endpoint value, and NaN values where either
+            # the temperature or precipitation is NaN. The inputs are broadcast against
+            # each other first, since apply_ufunc does not do this if they have
+            # different dimensions.
+            temperature_curr, precipitation_curr = np.broadcast_arrays(
+                temperature_curr, precipitation_curr
+            )
+            coords_curr = np.stack(
+                [
+                    _get_grid_coords(temperature_curr, *table_temp_grid[:2]),
+                    _get_grid_coords(precipitation_curr, *table_precip_grid[:2]),
+                ]
+            )
+            nan_mask = np.isnan(coords_curr).any(axis=0)
+            np.nan_to_num(coords_curr, copy=False)
+            suitability_curr = map_coordinates(
+                table_values,
+                coords_curr.reshape(2, -1),
+                output=np.float32,
+                order=1,
+                mode="nearest",
+            ).reshape(coords_curr.shape[1:])
+            suitability_curr[nan_mask] = np.nan
+            return suitability_curr
+
+        if interp_order == 0:
+            da_suitability = xr.apply_ufunc(
+                suitability_func,
+                temperature,
+                precipitation,
+                dask="parallelized",
+                output_dtypes=[table_values.dtype],
+            )
+        else:
+            da_suitability = xr.apply_ufunc(
+                suitability_func_bilinear,
+                temperature,
+                precipitation,
+                dask="parallelized",
+                output_dtypes=[np.float32],
+            )
         return da_suitability
+
+
+def suitability_1d(temperature, table_temperature, table_suitability):
+    """
+    Calculate suitability values from a temperature-dependent suitability table.
+
+    Linearly interpolates the suitability table at the given temperature values, with
+    values outside the range of the table taking the nearest endpoint value. This is
+    the calculation used by `SuitabilityModel` for temperature-only suitability tables,
+    and can be applied directly to NumPy arrays (avoiding the overhead of constructing
+    xarray objects, e.g., when evaluating suitability repeatedly on small arrays).
+
+    Parameters
+    ----------
+    temperature : array_like
+        Temperature values at which to calculate suitability.
+    table_temperature : array_like
+        Increasing temperature values at which the suitability table is defined.
+    table_suitability : array_like
+        Suitability values corresponding to `table_temperature`.
+
+    Returns
+    -------
+    numpy.ndarray
+        Suitability values (as 32-bit floats) with the same shape as `temperature`.
+    """
+    table_temperature = np.asarray(table_temperature)
+    table_suitability = np.asarray(table_suitability)
+    table_temperature_delta = _get_grid_spacing(table_temperature, rtol=1e-9)
+    return _suitability_1d(
+        temperature, table_temperature, table_suitability, table_temperature_delta
+    )
+
+
+def _suitability_1d(temperature, table_temp_vals, table_values, table_temp_delta):
+    # Implementation of suitability_1d, with the spacing of the table temperature values
+    # (or None if not equi-spaced) provided so that it need not be recomputed.
+    if table_temp_delta is None:
+        # np.interp starts its search for each value from the bracketing index found
+        # for the previous value, so spatially coherent temperature fields are
+        # interpolated without a full binary search per element.
+        suitability = np.interp(temperature, table_temp_vals, table_values)
+    else:
+        suitability = _interp_uniform(
+            temperature, table_temp_vals[0], table_temp_delta, table_values
+        )
+    return suitability.astype(np.float32)
+
+
+def _get_grid_spacing(vals, rtol):
+    # Return the spacing between consecutive values if they are equi-spaced (up to the
+    # specified relative tolerance), or None otherwise.
+    if len(vals) < 2:
+        return None
+    deltas = np.diff(vals)
+    if not np.all(np.isclose(deltas, deltas[0], rtol=rtol, atol=0)):
+        return None
+    return (vals[-1] - vals[0]) / (len(vals) - 1)
+
+
+def _get_grid_coords(x, x0, dx):
+    # Get the (fractional) positions of x on the grid x0 + dx * np.arange(n).
+    coords = np.array(x, dtype=float)
+    coords -= x0
+    coords /= dx
+    return coords
+
+
+def _get_nearest_inds(x, x0, dx, n):
+    # Get the indices of the nearest points to x on the grid x0 + dx * np.arange(n),
+    # with values outside the grid mapped to the nearest endpoint (and NaNs mapped to
+    # the first grid point).
+    inds = _get_grid_coords(x, x0, dx)
+    np.rint(inds, out=inds)
+    np.nan_to_num(inds, copy=False)
+    np.clip(inds, 0, n - 1, out=inds)
+    return inds.astype(np.intp)
+
+
+def _interp_uniform(x, x0, dx, fp):
+    # Equivalent to np.interp(x, x0 + dx * np.arange(len(fp)), fp), but with the index
+    # of the grid cell containing each value computed directly rather than by binary
+    # search. Values outside the grid take the nearest endpoint value, and NaNs are
+    # propagated.
+    n = len(fp)
+    pos = _get_grid_coords(x, x0, dx)
+    np.clip(pos, 0, n - 1, out=pos)
+    inds = np.minimum(np.nan_to_num(pos).astype(np.intp), n - 2)
+    frac = pos - inds
+    fp_lower = fp[inds]
+    return fp_lower + frac * (fp[inds + 1] - fp_lower)
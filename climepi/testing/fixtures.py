@@ -5,240 +5,165 @@ Extensive inspiration and lifting of definitions is taken from the test suite fo
 xcdat package (see https://github.com/xCDAT/xcdat/blob/main/tests/fixtures.py)
 """
 
+import functools
+
 import cftime
 import numpy as np
 import xarray as xr
 
-from climepi._xcdat import swap_lon_axis
-
-# Time
-time_yearly = xr.DataArray(
-    data=np.array(
-        [
-            cftime.DatetimeGregorian(2000, 7, 1, 12, 0, 0, 0, has_year_zero=False),
-            cftime.DatetimeGregorian(2001, 7, 1, 12, 0, 0, 0, has_year_zero=False),
-            cftime.DatetimeGregorian(2002, 7, 1, 12, 0, 0, 0, has_year_zero=False),
-        ],
-        dtype=object,
-    ),
-    dims=["time"],
-    attrs={
-        "axis": "T",
-        "long_name": "time",
-        "standard_name": "time",
-    },
-)
-time_monthly = xr.DataArray(
-    data=np.array(
-        [
-            cftime.DatetimeGregorian(2000, 1, 16, 12, 0, 0, 0, has_year_zero=False),
-            cftime.DatetimeGregorian(2000, 2, 15, 12, 0, 0, 0, has_year_zero=False),
-            cftime.DatetimeGregorian(2000, 3, 16, 12, 0, 0, 0, has_year_zero=False),
-            cftime.DatetimeGregorian(2000, 4, 16, 0, 0, 0, 0, has_year_zero=False),
-            cftime.DatetimeGregorian(2000, 5, 16, 12, 0, 0, 0, has_year_zero=False),
-            cftime.DatetimeGregorian(2000, 6, 16, 0, 0, 0, 0, has_year_zero=False),
-            cftime.DatetimeGregorian(2000, 7, 16, 12, 0, 0, 0, has_year_zero=False),
-            cftime.DatetimeGregorian(2000, 8, 16, 12, 0, 0, 0, has_year_zero=False),
-            cftime.DatetimeGregorian(2000, 9, 16, 0, 0, 0, 0, has_year_zero=False),
-            cftime.DatetimeGregorian(2000, 10, 16, 12, 0, 0, 0, has_year_zero=False),
-            cftime.DatetimeGregorian(2000, 11, 16, 0, 0, 0, 0, has_year_zero=False),
-            cftime.DatetimeGregorian(2000, 12, 16, 12, 0, 0, 0, has_year_zero=False),
-            cftime.DatetimeGregorian(2001, 1, 16, 12, 0, 0, 0, has_year_zero=False),
-            cftime.DatetimeGregorian(2001, 2, 15, 0, 0, 0, 0, has_year_zero=False),
-            cftime.DatetimeGregorian(2001, 12, 16, 12, 0, 0, 0, has_year_zero=False),
-        ],
-        dtype=object,
-    ),
-    dims=["time"],
-    attrs={
-        "axis": "T",
-        "long_name": "time",
-        "standard_name": "time",
-    },
-)
-time_daily = xr.DataArray(
-    data=np.array(
-        [
-            cftime.DatetimeGregorian(2000, 1, 28, 12, 0, 0, 0, has_year_zero=False),
-            cftime.DatetimeGregorian(2000, 1, 29, 12, 0, 0, 0, has_year_zero=False),
-            cftime.DatetimeGregorian(2000, 1, 30, 12, 0, 0, 0, has_year_zero=False),
-            cftime.DatetimeGregorian(2000, 1, 31, 12, 0, 0, 0, has_year_zero=False),
-            cftime.DatetimeGregorian(2000, 2, 1, 12, 0, 0, 0, has_year_zero=False),
-            cftime.DatetimeGregorian(2000, 2, 2, 12, 0, 0, 0, has_year_zero=False),
-            cftime.DatetimeGregorian(2000, 2, 3, 12, 0, 0, 0, has_year_zero=False),
-            cftime.DatetimeGregorian(2000, 2, 4, 12, 0, 0, 0, has_year_zero=False),
-            cftime.DatetimeGregorian(2000, 2, 5, 12, 0, 0, 0, has_year_zero=False),
-            cftime.DatetimeGregorian(2000, 2, 6, 12, 0, 0, 0, has_year_zero=False),
-            cftime.DatetimeGregorian(2000, 2, 7, 12, 0, 0, 0, has_year_zero=False),
-            cftime.DatetimeGregorian(2000, 2, 8, 12, 0, 0, 0, has_year_zero=False),
-        ],
-        dtype=object,
-    ),
-    dims=["time"],
-    attrs={
-        "axis": "T",
-        "long_name": "time",
-        "standard_name": "time",
-    },
-)
 
-time_bnds_yearly = xr.DataArray(
-    name="time_bnds",
-    data=np.array(
-        [
-            [
-                cftime.DatetimeGregorian(2000, 1, 1, 0, 0, 0, 0, has_year_zero=False),
-                cftime.DatetimeGregorian(2001, 1, 1, 0, 0, 0, 0, has_year_zero=False),
-            ],
-            [
-                cftime.DatetimeGregorian(2001, 1, 1, 0, 0, 0, 0, has_year_zero=False),
-                cftime.DatetimeGregorian(2002, 1, 1, 0, 0, 0, 0, has_year_zero=False),
-            ],
-            [
-                cftime.DatetimeGregorian(2002, 1, 1, 0, 0, 0, 0, has_year_zero=False),
-                cftime.DatetimeGregorian(2003, 1, 1, 0, 0, 0, 0, has_year_zero=False),
-            ],
-        ],
-        dtype=object,
-    ),
-    dims=["time", "bnds"],
-    attrs={
-        "xcdat_bounds": "True",
-    },
-)
-time_bnds_monthly = xr.DataArray(
-    name="time_bnds",
-    data=np.array(
-        [
-            [
-                cftime.DatetimeGregorian(2000, 1, 1, 0, 0, 0, 0, has_year_zero=False),
-                cftime.DatetimeGregorian(2000, 2, 1, 0, 0, 0, 0, has_year_zero=False),
-            ],
+# Time (constructed lazily and cached, since creating cftime objects is relatively slow;
+# the cached arrays should be copied before use)
+@functools.lru_cache(maxsize=None)
+def _get_time_yearly():
+    return xr.DataArray(
+        data=np.array(
             [
-                cftime.DatetimeGregorian(2000, 2, 1, 0, 0, 0, 0, has_year_zero=False),
-                cftime.DatetimeGregorian(2000, 3, 1, 0, 0, 0, 0, has_year_zero=False),
+                cftime.DatetimeGregorian(2000, 7, 1, 12, 0, 0, 0, has_year_zero=False),
+                cftime.DatetimeGregorian(2001, 7, 1, 12, 0, 0, 0, has_year_zero=False),
+                cftime.DatetimeGregorian(2002, 7, 1, 12, 0, 0, 0, has_year_zero=False),
             ],
-            [
-                cftime.DatetimeGregorian(2000, 3, 1, 0, 0, 0, 0, has_year_zero=False),
-                cftime.DatetimeGregorian(2000, 4, 1, 0, 0, 0, 0, has_year_zero=False),
-            ],
-            [
-                cftime.DatetimeGregorian(2000, 4, 1, 0, 0, 0, 0, has_year_zero=False),
-                cftime.DatetimeGregorian(2000, 5, 1, 0, 0, 0, 0, has_year_zero=False),
-            ],
-            [
-                cftime.DatetimeGregorian(2000, 5, 1, 0, 0, 0, 0, has_year_zero=False),
-                cftime.DatetimeGregorian(2000, 6, 1, 0, 0, 0, 0, has_year_zero=False),
-            ],
-            [
-                cftime.DatetimeGregorian(2000, 6, 1, 0, 0, 0, 0, has_year_zero=False),
-                cftime.DatetimeGregorian(2000, 7, 1, 0, 0, 0, 0, has_year_zero=False),
-            ],
-            [
-                cftime.DatetimeGregorian(2000, 7, 1, 0, 0, 0, 0, has_year_zero=False),
-                cftime.DatetimeGregorian(2000, 8, 1, 0, 0, 0, 0, has_year_zero=False),
-            ],
-            [
-                cftime.DatetimeGregorian(2000, 8, 1, 0, 0, 0, 0, has_year_zero=False),
-                cftime.DatetimeGregorian(2000, 9, 1, 0, 0, 0, 0, has_year_zero=False),
-            ],
-            [
-                cftime.DatetimeGregorian(2000, 9, 1, 0, 0, 0, 0, has_year_zero=False),
-                cftime.DatetimeGregorian(2000, 10, 1, 0, 0, 0, 0, has_year_zero=False),
-            ],
-            [
-                cftime.DatetimeGregorian(2000, 10, 1, 0, 0, 0, 0, has_year_zero=False),
-                cftime.DatetimeGregorian(2000, 11, 1, 0, 0, 0, 0, has_year_zero=False),
-            ],
-            [
-                cftime.DatetimeGregorian(2000, 11, 1, 0, 0, 0, 0, has_year_zero=False),
-                cftime.DatetimeGregorian(2000, 12, 1, 0, 0, 0, 0, has_year_zero=False),
-            ],
-            [
-                cftime.DatetimeGregorian(2000, 12, 1, 0, 0, 0, 0, has_year_zero=False),
-                cftime.DatetimeGregorian(2001, 1, 1, 0, 0, 0, 0, has_year_zero=False),
-            ],
-            [
-                cftime.DatetimeGregorian(2001, 1, 1, 0, 0, 0, 0, has_year_zero=False),
-                cftime.DatetimeGregorian(2001, 2, 1, 0, 0, 0, 0, has_year_zero=False),
-            ],
-            [
-                cftime.DatetimeGregorian(2001, 2, 1, 0, 0, 0, 0, has_year_zero=False),
-                cftime.DatetimeGregorian(2001, 3, 1, 0, 0, 0, 0, has_year_zero=False),
-            ],
-            [
-                cftime.DatetimeGregorian(2001, 12, 1, 0, 0, 0, 0, has_year_zero=False),
-                cftime.DatetimeGregorian(2002, 1, 1, 0, 0, 0, 0, has_year_zero=False),
-            ],
-        ],
-        dtype=object,
-    ),
-    dims=["time", "bnds"],
-    attrs={
-        "xcdat_bounds": "True",
-    },
-)
+            dtype=object,
+        ),
+        dims=["time"],
+        attrs={
+            "axis": "T",
+            "long_name": "time",
+            "standard_name": "time",
+        },
+    )
 
-time_bnds_daily = xr.DataArray(
-    name="time_bnds",
-    data=np.array(
-        [
-            [
-                cftime.DatetimeGregorian(2000, 1, 28, 0, 0, 0, 0, has_year_zero=False),
-                cftime.DatetimeGregorian(2000, 1, 29, 0, 0, 0, 0, has_year_zero=False),
-            ],
-            [
-                cftime.DatetimeGregorian(2000, 1, 29, 0, 0, 0, 0, has_year_zero=False),
-                cftime.DatetimeGregorian(2000, 1, 30, 0, 0, 0, 0, has_year_zero=False),
-            ],
-            [
-                cftime.DatetimeGregorian(2000, 1, 30, 0, 0, 0, 0, has_year_zero=False),
-                cftime.DatetimeGregorian(2000, 1, 31, 0, 0, 0, 0, has_year_zero=False),
-            ],
-            [
-                cftime.DatetimeGregorian(2000, 1, 31, 0, 0, 0, 0, has_year_zero=False),
-                cftime.DatetimeGregorian(2000, 2, 1, 0, 0, 0, 0, has_year_zero=False),
-            ],
-            [
-                cftime.DatetimeGregorian(2000, 2, 1, 0, 0, 0, 0, has_year_zero=False),
-                cftime.DatetimeGregorian(2000, 2, 2, 0, 0, 0, 0, has_year_zero=False),
-            ],
-            [
-                cftime.DatetimeGregorian(2000, 2, 2, 0, 0, 0, 0, has_year_zero=False),
-                cftime.DatetimeGregorian(2000, 2, 3, 0, 0, 0, 0, has_year_zero=False),
-            ],
-            [
-                cftime.DatetimeGregorian(2000, 2, 3, 0, 0, 0, 0, has_year_zero=False),
-                cftime.DatetimeGregorian(2000, 2, 4, 0, 0, 0, 0, has_year_zero=False),
-            ],
-            [
-                cftime.DatetimeGregorian(2000, 2, 4, 0, 0, 0, 0, has_year_zero=False),
-                cftime.DatetimeGregorian(2000, 2, 5, 0, 0, 0, 0, has_year_zero=False),
-            ],
-            [
-                cftime.DatetimeGregorian(2000, 2, 5, 0, 0, 0, 0, has_year_zero=False),
-                cftime.DatetimeGregorian(2000, 2, 6, 0, 0, 0, 0, has_year_zero=False),
-            ],
-            [
-                cftime.DatetimeGregorian(2000, 2, 6, 0, 0, 0, 0, has_year_zero=False),
-                cftime.DatetimeGregorian(2000, 2, 7, 0, 0, 0, 0, has_year_zero=False),
-            ],
+
+@functools.lru_cache(maxsize=None)
+def _get_time_monthly():
+    return xr.DataArray(
+        data=np.array(
             [
-                cftime.DatetimeGregorian(2000, 2, 7, 0, 0, 0, 0, has_year_zero=False),
-                cftime.DatetimeGregorian(2000, 2, 8, 0, 0, 0, 0, has_year_zero=False),
+                cftime.DatetimeGregorian(2000, 1, 16, 12, 0, 0, 0, has_year_zero=False),
+                cftime.DatetimeGregorian(2000, 2, 15, 12, 0, 0, 0, has_year_zero=False),
+                cftime.DatetimeGregorian(2000, 3, 16, 12, 0, 0, 0, has_year_zero=False),
+                cftime.DatetimeGregorian(2000, 4, 16, 0, 0, 0, 0, has_year_zero=False),
+                cftime.DatetimeGregorian(2000, 5, 16, 12, 0, 0, 0, has_year_zero=False),
+                cftime.DatetimeGregorian(2000, 6, 16, 0, 0, 0, 0, has_year_zero=False),
+                cftime.DatetimeGregorian(2000, 7, 16, 12, 0, 0, 0, has_year_zero=False),
+                cftime.DatetimeGregorian(2000, 8, 16, 12, 0, 0, 0, has_year_zero=False),
+                cftime.DatetimeGregorian(2000, 9, 16, 0, 0, 0, 0, has_year_zero=False),
+                cftime.DatetimeGregorian(
+                    2000, 10, 16, 12, 0, 0, 0, has_year_zero=False
+                ),
+                cftime.DatetimeGregorian(2000, 11, 16, 0, 0, 0, 0, has_year_zero=False),
+                cftime.DatetimeGregorian(
+                    2000, 12, 16, 12, 0, 0, 0, has_year_zero=False
+                ),
+                cftime.DatetimeGregorian(2001, 1, 16, 12, 0, 0, 0, has_year_zero=False),
+                cftime.DatetimeGregorian(2001, 2, 15, 0, 0, 0, 0, has_year_zero=False),
+                cftime.DatetimeGregorian(
+                    2001, 12, 16, 12, 0, 0, 0, has_year_zero=False
+                ),
             ],
+            dtype=object,
+        ),
+        dims=["time"],
+        attrs={
+            "axis": "T",
+            "long_name": "time",
+            "standard_name": "time",
+        },
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _get_time_daily():
+    return xr.DataArray(
+        data=np.array(
             [
-                cftime.DatetimeGregorian(2000, 2, 8, 0, 0, 0, 0, has_year_zero=False),
-                cftime.DatetimeGregorian(2000, 2, 9, 0, 0, 0, 0, has_year_zero=False),
+                cftime.DatetimeGregorian(2000, 1, 28, 12, 0, 0, 0, has_year_zero=False),
+                cftime.DatetimeGregorian(2000, 1, 29, 12, 0, 0, 0, has_year_zero=False),
+                cftime.DatetimeGregorian(2000, 1, 30, 12, 0, 0, 0, has_year_zero=False),
+                cftime.DatetimeGregorian(2000, 1, 31, 12, 0, 0, 0, has_year_zero=False),
+                cftime.DatetimeGregorian(2000, 2, 1, 12, 0, 0, 0, has_year_zero=False),
+                cftime.DatetimeGregorian(2000, 2, 2, 12, 0, 0, 0, has_year_zero=False),
+                cftime.DatetimeGregorian(2000, 2, 3, 12, 0, 0, 0, has_year_zero=False),
+                cftime.DatetimeGregorian(2000, 2, 4, 12, 0, 0, 0, has_year_zero=False),
+                cftime.DatetimeGregorian(2000, 2, 5, 12, 0, 0, 0, has_year_zero=False),
+                cftime.DatetimeGregorian(2000, 2, 6, 12, 0, 0, 0, has_year_zero=False),
+                cftime.DatetimeGregorian(2000, 2, 7, 12, 0, 0, 0, has_year_zero=False),
+                cftime.DatetimeGregorian(2000, 2, 8, 12, 0, 0, 0, has_year_zero=False),
             ],
-        ],
-        dtype=object,
-    ),
-    dims=["time", "bnds"],
-    attrs={
-        "xcdat_bounds": "True",
-    },
-)
+            dtype=object,
+        ),
+        dims=["time"],
+        attrs={
+            "axis": "T",
+            "long_name": "time",
+            "standard_name": "time",
+        },
+    )
+
+
+def _get_time_bnds(time_lb, time_rb):
+    # Stack left and right time bounds (constructed as separate cftime date ranges,
+    # which is faster than constructing each cftime object individually)
+    return xr.DataArray(
+        name="time_bnds",
+        data=np.stack([np.asarray(time_lb), np.asarray(time_rb)], axis=1),
+        dims=["time", "bnds"],
+        attrs={
+            "xcdat_bounds": "True",
+        },
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _get_time_bnds_yearly():
+    return _get_time_bnds(
+        xr.date_range(start="2000-01-01", periods=3, freq="YS", use_cftime=True),
+        xr.date_range(start="2001-01-01", periods=3, freq="YS", use_cftime=True),
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _get_time_bnds_monthly():
+    # Monthly time points run from January 2000 to February 2001, then December 2001
+    return _get_time_bnds(
+        xr.date_range(
+            start="2000-01-01", periods=14, freq="MS", use_cftime=True
+        ).append(
+            xr.date_range(start="2001-12-01", periods=1, freq="MS", use_cftime=True)
+        ),
+        xr.date_range(
+            start="2000-02-01", periods=14, freq="MS", use_cftime=True
+        ).append(
+            xr.date_range(start="2002-01-01", periods=1, freq="MS", use_cftime=True)
+        ),
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _get_time_bnds_daily():
+    return _get_time_bnds(
+        xr.date_range(start="2000-01-28", periods=12, freq="D", use_cftime=True),
+        xr.date_range(start="2000-01-29", periods=12, freq="D", use_cftime=True),
+    )
+
+
+# Public names for the (lazily constructed) time coordinates and bounds
+_LAZY_ATTRS = {
+    "time_yearly": _get_time_yearly,
+    "time_monthly": _get_time_monthly,
+    "time_daily": _get_time_daily,
+    "time_bnds_yearly": _get_time_bnds_yearly,
+    "time_bnds_monthly": _get_time_bnds_monthly,
+    "time_bnds_daily": _get_time_bnds_daily,
+}
+
+
+def __getattr__(name):
+    """Get the time coordinates and bounds, constructing them on first access."""
+    if name in _LAZY_ATTRS:
+        return _LAZY_ATTRS[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 # Latitude
 lat = xr.DataArray(
@@ -275,6 +200,23 @@ lon_bnds = xr.DataArray(
     attrs={"xcdat_bounds": "True"},
 )
 
+# Longitude converted to the (-180, 180) convention (equivalent to applying xcdat's
+# swap_lon_axis, which maps the coordinates and bounds to [-180, 180) and sorts by
+# longitude, but precomputed to avoid rearranging each generated dataset)
+_lon_roll_shift = 2
+lon_180_180 = xr.DataArray(
+    data=np.roll(((lon.values + 180) % 360) - 180, _lon_roll_shift),
+    dims=["lon"],
+    attrs=lon.attrs,
+)
+lon_bnds_180_180 = xr.DataArray(
+    name="lon_bnds",
+    data=np.roll(((lon_bnds.values + 180) % 360) - 180, _lon_roll_shift, axis=0),
+    coords={"lon": lon_180_180},
+    dims=["lon", "bnds"],
+    attrs={"xcdat_bounds": "True"},
+)
+
 
 # Dataset generation
 def generate_dataset(
@@ -284,6 +226,7 @@ def generate_dataset(
     lon_0_360=True,
     extra_dims=None,
     has_bounds=True,
+    size="default",
 ):
     """
     Generate a test dataset.
@@ -303,6 +246,11 @@ def generate_dataset(
         DataArray.expand_dims method). Default is None.
     has_bounds : bool, optional
         Whether to include bounds in the dataset. Default is True.
+    size : str, optional
+        Size of the spatial grid (options are "default", for a grid with four latitude
+        and four longitude points, or "tiny", for a single grid point). The "tiny"
+        option can be used in tests that do not inspect spatial values. Default is
+        "default".
 
     Returns
     -------
@@ -312,18 +260,33 @@ def generate_dataset(
     if isinstance(data_var, str):
         data_var = [data_var]
     if frequency == "monthly":
-        time = time_monthly
-        time_bnds = time_bnds_monthly
+        time = _get_time_monthly()
+        time_bnds = _get_time_bnds_monthly()
     elif frequency == "yearly":
-        time = time_yearly
-        time_bnds = time_bnds_yearly
+        time = _get_time_yearly()
+        time_bnds = _get_time_bnds_yearly()
     elif frequency == "daily":
-        time = time_daily
-        time_bnds = time_bnds_daily
-    # Create the base dataset.
+        time = _get_time_daily()
+        time_bnds = _get_time_bnds_daily()
+    if lon_0_360:
+        lon_curr, lon_bnds_curr = lon, lon_bnds
+    else:
+        lon_curr, lon_bnds_curr = lon_180_180, lon_bnds_180_180
+    lat_curr, lat_bnds_curr = lat, lat_bnds
+    if size == "tiny":
+        # Keep the first latitude and the longitude at 0 degrees (which is moved by the
+        # roll applied when converting to the (-180, 180) convention)
+        lon_ind = 0 if lon_0_360 else _lon_roll_shift
+        lat_curr, lat_bnds_curr = lat_curr[:1], lat_bnds_curr[:1]
+        lon_curr = lon_curr[lon_ind : lon_ind + 1]
+        lon_bnds_curr = lon_bnds_curr[lon_ind : lon_ind + 1]
+    elif size != "default":
+        raise ValueError(f"Invalid size: {size}.")
+    # Create the base dataset (each data variable gets its own writeable array, since
+    # expand_dims returns a read-only view)
     da = xr.DataArray(
-        data=np.ones((len(time), len(lat), len(lon)), dtype=dtype),
-        coords={"time": time.copy(), "lat": lat.copy(), "lon": lon.copy()},
+        data=np.ones((len(time), len(lat_curr), len(lon_curr)), dtype=dtype),
+        coords={"time": time.copy(), "lat": lat_curr, "lon": lon_curr},
         dims=["time", "lat", "lon"],
     ).expand_dims(extra_dims)
     ds = xr.Dataset(
@@ -334,12 +297,10 @@ def generate_dataset(
     ds["time"].encoding["units"] = "days since 2000-01-01"
     # Add bounds
     if has_bounds:
-        ds["lat_bnds"] = lat_bnds.copy()
-        ds["lon_bnds"] = lon_bnds.copy()
+        ds["lat_bnds"] = lat_bnds_curr.copy()
+        ds["lon_bnds"] = lon_bnds_curr.copy()
         ds["time_bnds"] = time_bnds.copy()
         ds["lat"].attrs["bounds"] = "lat_bnds"
         ds["lon"].attrs["bounds"] = "lon_bnds"
         ds["time"].attrs["bounds"] = "time_bnds"
-    if not lon_0_360:
-        ds = swap_lon_axis(ds, to=(-180, 180))
     return ds
@@ -57,20 +57,19 @@ def add_bnds_from_other(ds, ds_from):
     xarray.Dataset
         A copy of ds with the relevant bounds variables from ds_from added.
     """
-    ds_out = ds.copy()
-    for var in ["lat", "lon", "time"]:
-        bnd_var = var + "_bnds"
-        if (
-            bnd_var in ds_out.data_vars
-            or bnd_var not in ds_from
-            or var not in ds_out
-            or var not in ds_from
-            or not ds_out[var].equals(ds_from[var])
-        ):
-            continue
-        ds_out[bnd_var] = ds_from[bnd_var]
-        ds_out[bnd_var].attrs = ds_from[bnd_var].attrs
-        ds_out[var].attrs.update(bounds=bnd_var)
+    bnds = {
+        var + "_bnds": ds_from[var + "_bnds"]
+        for var in ["lat", "lon", "time"]
+        if var + "_bnds" not in ds.data_vars
+        and var + "_bnds" in ds_from
+        and var in ds
+        and var in ds_from
+        and ds[var].equals(ds_from[var])
+    }
+    # Add all bounds in a single assignment (the bounds keep their attributes)
+    ds_out = ds.assign(bnds)
+    for bnd_var in bnds:
+        ds_out[bnd_var.removesuffix("_bnds")].attrs.update(bounds=bnd_var)
     return ds_out
 
 
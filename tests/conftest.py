@@ -0,0 +1,66 @@
+"""Shared pytest fixtures for the climepi test suite."""
+
+import pytest
+
+from climepi.testing.fixtures import generate_dataset
+
+
+def pytest_addoption(parser):
+    """
+    Add options for running slow tests.
+
+    The --run-slow option runs tests marked as slow (which are skipped by default), and
+    the --mc-size option sets the number of time points and repeats (as a comma
+    separated pair) used in Monte Carlo tests.
+    """
+    parser.addoption(
+        "--run-slow", action="store_true", default=False, help="run slow tests"
+    )
+    parser.addoption(
+        "--mc-size",
+        action="store",
+        default="2000,30",
+        help="number of time points and repeats for Monte Carlo tests (e.g. 2000,30)",
+    )
+
+
+def pytest_configure(config):
+    """Register the marker for slow tests."""
+    config.addinivalue_line("markers", "slow: mark test as slow to run")
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip tests marked as slow unless the --run-slow option is given."""
+    if config.getoption("--run-slow"):
+        return
+    skip_slow = pytest.mark.skip(reason="need --run-slow option to run")
+    for item in items:
+        if "slow" in item.keywords:
+            item.add_marker(skip_slow)
+
+
+@pytest.fixture(scope="session")
+def cached_dataset():
+    """
+    Generate test datasets, caching the results across the test session.
+
+    Returns a function with the same arguments as generate_dataset. Since the returned
+    datasets are shared between tests, they should be copied (a shallow copy suffices
+    if data values are only replaced, rather than modified in place) before use.
+    """
+    cache = {}
+
+    def _cached_dataset(**kwargs):
+        key = repr(sorted(kwargs.items()))
+        if key not in cache:
+            cache[key] = generate_dataset(**kwargs)
+        return cache[key]
+
+    return _cached_dataset
+
+
+@pytest.fixture(scope="session")
+def mc_size(request):
+    """Get the number of time points and repeats to use in Monte Carlo tests."""
+    n_time, repeats = (int(x) for x in request.config.getoption("--mc-size").split(","))
+    return n_time, repeats
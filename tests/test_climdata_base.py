@@ -7,45 +7,43 @@ import pytest
 from climepi import climdata
 
 
-@pytest.mark.parametrize("data_source", ["test", "lens2", "isimip"])
-def test_get_climate_data(data_source):
-    """Unit test for the get_climate_data function."""
-    frequency = "hourly"
-    subset = {
-        "scenarios": ["overcast", "sunny"],
-        "models": ["length", "inswinger"],
-        "realizations": [1, 2],
-        "years": [2015, 2016, 2018, 2100],
-        "locations": "gabba",
-        "lon_range": None,
-        "lat_range": None,
-    }
-    save_dir = "."
-    download = "probably"
-    force_remake = "perhaps"
-    max_subset_wait_time = 30
-
-    kwargs_in = {
-        "data_source": data_source,
-        "frequency": frequency,
-        "subset": subset,
-        "save_dir": save_dir,
-        "download": download,
-        "force_remake": force_remake,
-        "max_subset_wait_time": max_subset_wait_time,
+@pytest.fixture
+def climate_data_kwargs():
+    """Keyword arguments (other than data_source) used to get climate data."""
+    return {
+        "frequency": "hourly",
+        "subset": {
+            "scenarios": ["overcast", "sunny"],
+            "models": ["length", "inswinger"],
+            "realizations": [1, 2],
+            "years": [2015, 2016, 2018, 2100],
+            "locations": "gabba",
+            "lon_range": None,
+            "lat_range": None,
+        },
+        "save_dir": ".",
+        "download": "probably",
+        "force_remake": "perhaps",
+        "max_subset_wait_time": 30,
     }
 
-    if data_source == "test":
-        with pytest.raises(ValueError):
-            climdata.get_climate_data(**kwargs_in)
-        return
+
+@pytest.mark.parametrize("data_source", ["lens2", "isimip"])
+def test_get_climate_data(data_source, climate_data_kwargs):
+    """Unit test for the get_climate_data function."""
+    frequency = climate_data_kwargs["frequency"]
+    subset = climate_data_kwargs["subset"]
+    save_dir = climate_data_kwargs["save_dir"]
+    download = climate_data_kwargs["download"]
+    force_remake = climate_data_kwargs["force_remake"]
+    max_subset_wait_time = climate_data_kwargs["max_subset_wait_time"]
 
     if data_source == "lens2":
         to_patch = "climepi.climdata._base.CESMDataGetter"
     elif data_source == "isimip":
         to_patch = "climepi.climdata._base.ISIMIPDataGetter"
     with patch(to_patch, autospec=True) as mock_data_getter:
-        result = climdata.get_climate_data(**kwargs_in)
+        result = climdata.get_climate_data(data_source, **climate_data_kwargs)
         if data_source == "lens2":
             mock_data_getter.assert_called_once_with(
                 frequency=frequency,
@@ -68,6 +66,12 @@ def test_get_climate_data(data_source):
         assert result == mock_data_getter.return_value.get_data.return_value
 
 
+def test_get_climate_data_invalid_source(climate_data_kwargs):
+    """Test that get_climate_data raises an error for an invalid data source."""
+    with pytest.raises(ValueError):
+        climdata.get_climate_data("test", **climate_data_kwargs)
+
+
 def test_get_climate_data_file_names():
     """Test the get_climate_data_file_names function."""
     data_source = "isimip"
@@ -94,35 +98,13 @@ def test_get_climate_data_file_names():
     assert sorted(result) == sorted(expected)
 
 
-@pytest.mark.parametrize("data_source", ["lens2", "isimip", "test"])
-def test_get_data_getter(data_source):
+@pytest.mark.parametrize("data_source", ["lens2", "isimip"])
+def test_get_data_getter(data_source, climate_data_kwargs):
     """Test the _get_data_getter function."""
-    frequency = "hourly"
-    subset = {
-        "scenarios": ["overcast", "sunny"],
-        "models": ["length", "inswinger"],
-        "realizations": [1, 2],
-        "years": [2015, 2016, 2018, 2100],
-        "locations": "gabba",
-        "lon_range": None,
-        "lat_range": None,
-    }
-    save_dir = "."
-    download = "probably"
-    force_remake = "perhaps"
-    max_subset_wait_time = 30
-    if data_source == "test":
-        with pytest.raises(ValueError):
-            climdata._base._get_data_getter(
-                data_source,
-                frequency=frequency,
-                subset=subset,
-                save_dir=save_dir,
-                download=download,
-                force_remake=force_remake,
-                max_subset_wait_time=max_subset_wait_time,
-            )
-        return
+    frequency = climate_data_kwargs["frequency"]
+    subset = climate_data_kwargs["subset"]
+    save_dir = climate_data_kwargs["save_dir"]
+    max_subset_wait_time = climate_data_kwargs["max_subset_wait_time"]
     result = climdata._base._get_data_getter(
         data_source,
         frequency=frequency,
@@ -144,3 +126,9 @@ def test_get_data_getter(data_source):
     assert result._frequency == frequency
     assert result._subset == subset
     assert str(result._save_dir) == save_dir
+
+
+def test_get_data_getter_invalid_source(climate_data_kwargs):
+    """Test that _get_data_getter raises an error for an invalid data source."""
+    with pytest.raises(ValueError):
+        climdata._base._get_data_getter("test", **climate_data_kwargs)
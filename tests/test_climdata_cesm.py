@@ -12,12 +12,25 @@ import intake_esm
 import netCDF4  # noqa (avoids warning https://github.com/pydata/xarray/issues/7259)
 import numpy as np
 import numpy.testing as npt
+import pandas as pd
 import pytest
 import xarray as xr
 import xarray.testing as xrt
 
 from climepi.climdata._cesm import CESMDataGetter
 
+# Paths of the remote data files expected to be found for each remote data frequency
+EXPECTED_REMOTE_PATHS = {
+    remote_frequency: frozenset(
+        "s3://ncar-cesm2-lens/atm/"
+        + f"{remote_frequency}/cesm2LE-{forcing}-{assumption}-{var}.zarr"
+        for forcing in ["historical", "ssp370"]
+        for assumption in ["cmip6", "smbb"]
+        for var in ["TREFHT", "PRECC", "PRECL"]
+    )
+    for remote_frequency in ["daily", "monthly"]
+}
+
 
 @pytest.mark.parametrize("frequency", ["daily", "monthly", "yearly"])
 def test_find_remote_data(frequency):
@@ -32,8 +45,11 @@ def test_find_remote_data(frequency):
 
     ds = xr.Dataset(
         data_vars={
-            var: xr.DataArray(np.random.rand(6, 4), dims=["time", "member_id"])
-            for var in ["TREFHT", "PRECC", "PRECL"]
+            var: xr.DataArray(
+                np.arange(6 * 4, dtype=float).reshape(6, 4) + 100 * i,
+                dims=["time", "member_id"],
+            )
+            for i, var in enumerate(["TREFHT", "PRECC", "PRECL"])
         },
         coords={
             "time": xr.DataArray(np.arange(6), dims="time"),
@@ -64,17 +80,11 @@ def test_find_remote_data(frequency):
     call_catalog_subset = mock_to_dataset_dict.call_args.args[0]
     call_kwargs = mock_to_dataset_dict.call_args.kwargs
     assert isinstance(call_catalog_subset, intake_esm.core.esm_datastore)
-    assert sorted(call_catalog_subset.df.path.tolist()) == sorted(
-        [
-            "s3://ncar-cesm2-lens/atm/"
-            + f"{remote_frequency}/cesm2LE-{forcing}-{assumption}-{var}.zarr"
-            for forcing in ["historical", "ssp370"]
-            for assumption in ["cmip6", "smbb"]
-            for var in ["TREFHT", "PRECC", "PRECL"]
-        ]
-    )
+    call_paths = call_catalog_subset.df.path.tolist()
+    assert len(call_paths) == len(EXPECTED_REMOTE_PATHS[remote_frequency])
+    assert set(call_paths) == EXPECTED_REMOTE_PATHS[remote_frequency]
     assert call_kwargs == {"storage_options": {"anon": True}}
-    xrt.assert_identical(data_getter._ds, ds)
+    xrt.assert_equal(data_getter._ds, ds)
 
 
 @pytest.mark.parametrize("year_mode", ["single", "multiple"])
@@ -84,14 +94,19 @@ def test_find_remote_data(frequency):
 )
 def test_subset_remote_data(year_mode, location_mode):
     """Test the _subset_remote_data method of the CESMDataGetter class."""
-    time_lb = xr.cftime_range(start="2001-01-01", periods=36, freq="MS")
-    time_rb = xr.cftime_range(start="2001-02-01", periods=36, freq="MS")
-    time_bnds = xr.DataArray(np.array([time_lb, time_rb]).T, dims=("time", "nbnd"))
+    # (numpy datetimes suffice here, as only the years of the time points are used)
+    time_lb = pd.date_range(start="2001-01-01", periods=36, freq="MS")
+    time_rb = pd.date_range(start="2001-02-01", periods=36, freq="MS")
+    time_bnds = xr.DataArray(
+        np.stack([np.asarray(time_lb), np.asarray(time_rb)], axis=1),
+        dims=("time", "nbnd"),
+    )
     time = time_bnds.mean(dim="nbnd")
     ds_all = xr.Dataset(
         data_vars={
             "gus": xr.DataArray(
-                np.random.rand(36, 4, 3, 5), dims=["time", "member_id", "lat", "lon"]
+                np.arange(36 * 4 * 3 * 5, dtype=float).reshape(36, 4, 3, 5),
+                dims=["time", "member_id", "lat", "lon"],
             ),
         },
         coords={
@@ -140,7 +155,7 @@ def test_subset_remote_data(year_mode, location_mode):
     data_getter._ds = ds_all
     data_getter._subset_remote_data()
     if location_mode in ["grid_lon_0_360", "grid_lon_180_180"]:
-        xrt.assert_identical(
+        xrt.assert_equal(
             data_getter._ds,
             ds_all.isel(
                 time=time_inds_expected,
@@ -150,7 +165,7 @@ def test_subset_remote_data(year_mode, location_mode):
             ),
         )
     else:
-        xrt.assert_identical(
+        xrt.assert_equal(
             data_getter._ds,
             ds_all.isel(time=time_inds_expected, member_id=[0, 2]).climepi.sel_geo(
                 np.atleast_1d(locations).tolist()
@@ -165,7 +180,9 @@ def test_download_remote_data(mock_to_netcdf):
 
     The download is mocked to avoid actually downloading the remote data.
     """
-    ds = xr.Dataset(data_vars={"chris": xr.DataArray(np.random.rand(6), dims=["ball"])})
+    ds = xr.Dataset(
+        data_vars={"chris": xr.DataArray(np.arange(6, dtype=float), dims=["ball"])}
+    )
     data_getter = CESMDataGetter()
     data_getter._temp_save_dir = pathlib.Path(".")
     data_getter._ds = ds
@@ -189,11 +206,17 @@ def test_open_temp_data():
     time_rb = xr.cftime_range(
         start="2001-02-01", periods=12, freq="MS", calendar="noleap"
     )
-    time_bnds = xr.DataArray(np.array([time_lb, time_rb]).T, dims=("time", "nbnd"))
+    time_bnds = xr.DataArray(
+        np.stack([np.asarray(time_lb), np.asarray(time_rb)], axis=1),
+        dims=("time", "nbnd"),
+    )
     time = time_bnds.mean(dim="nbnd")
     ds = xr.Dataset(
         data_vars={
-            "mark": xr.DataArray(np.random.rand(12, 4), dims=["time", "member_id"]),
+            "mark": xr.DataArray(
+                np.arange(12 * 4, dtype=float).reshape(12, 4),
+                dims=["time", "member_id"],
+            ),
         },
         coords={
             "time": time,
@@ -235,19 +258,25 @@ def test_process_data(frequency):
     time_rb = xr.cftime_range(
         start="2001-02-01", periods=36, freq="MS", calendar="noleap"
     )
-    time_bnds_in = xr.DataArray(np.array([time_lb, time_rb]).T, dims=("time", "nbnd"))
+    time_bnds_in = xr.DataArray(
+        np.stack([np.asarray(time_lb), np.asarray(time_rb)], axis=1),
+        dims=("time", "nbnd"),
+    )
     time_in = time_bnds_in.mean(dim="nbnd").assign_attrs(bounds="time_bnds")
     time_in.encoding = {"calendar": "noleap", "units": "days since 2000-01-01"}
     ds_unprocessed = xr.Dataset(
         data_vars={
             "TREFHT": xr.DataArray(
-                np.random.rand(36, 2, 1, 1), dims=["time", "member_id", "lat", "lon"]
+                280 + np.arange(36 * 2, dtype=float).reshape(36, 2, 1, 1),
+                dims=["time", "member_id", "lat", "lon"],
             ),
             "PRECC": xr.DataArray(
-                np.random.rand(36, 2, 1, 1), dims=["time", "member_id", "lat", "lon"]
+                np.arange(36 * 2, dtype=float).reshape(36, 2, 1, 1) / 1e8,
+                dims=["time", "member_id", "lat", "lon"],
             ),
             "PRECL": xr.DataArray(
-                np.random.rand(36, 2, 1, 1), dims=["time", "member_id", "lat", "lon"]
+                np.arange(36 * 2, 0, -1, dtype=float).reshape(36, 2, 1, 1) / 1e9,
+                dims=["time", "member_id", "lat", "lon"],
             ),
         },
         coords={
@@ -350,6 +350,7 @@ def test_open_local_data():
         ]
         # Note data_vars="minimal" ensures correct bounds handling
         assert kwargs["data_vars"] == "minimal"
+        assert kwargs["parallel"]
         return xr.combine_by_coords(_ds_list, data_vars="minimal")
 
     data_getter = ClimateDataGetter(
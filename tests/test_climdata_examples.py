@@ -9,6 +9,14 @@ import pytest
 from climepi import climdata
 
 
+@pytest.fixture(autouse=True)
+def clear_data_version_cache():
+    """Clear the cached data version (since get_versions is patched in some tests)."""
+    climdata._examples._get_data_version.cache_clear()
+    yield
+    climdata._examples._get_data_version.cache_clear()
+
+
 @patch.dict(
     climdata._examples.EXAMPLES,
     {
@@ -29,14 +37,22 @@ from climepi import climdata
 @patch.object(climdata._examples, "get_climate_data", return_value="not real")
 @patch.object(climdata._examples, "_fetch_formatted_example_dataset")
 @pytest.mark.parametrize("name", ["shot", "leave"])
+@pytest.mark.parametrize("force_redownload", [False, True])
 @pytest.mark.parametrize("force_remake", [False, True])
 def test_get_example_dataset(
-    mock_fetch_formatted_example_dataset, mock_get_climate_data, name, force_remake
+    mock_fetch_formatted_example_dataset,
+    mock_get_climate_data,
+    name,
+    force_redownload,
+    force_remake,
 ):
     """Test the get_example_dataset method."""
     base_dir = "not/a/real/dir"
     ds = climdata.get_example_dataset(
-        name, base_dir=base_dir, force_remake=force_remake
+        name,
+        base_dir=base_dir,
+        force_redownload=force_redownload,
+        force_remake=force_remake,
     )
 
     data_dir_expected = pathlib.Path(base_dir) / name
@@ -45,7 +61,7 @@ def test_get_example_dataset(
         mock_fetch_formatted_example_dataset.assert_not_called()
     else:
         mock_fetch_formatted_example_dataset.assert_called_once_with(
-            name, data_dir_expected
+            name, data_dir_expected, force_redownload=force_redownload
         )
     mock_get_climate_data.assert_called_once_with(
         data_source="bat",
@@ -106,6 +122,7 @@ def test_get_data_version():
         climdata._examples, "get_versions", return_value={"version": "4.2.0"}
     ):
         assert climdata._examples._get_data_version() == "v4.2.0"
+    climdata._examples._get_data_version.cache_clear()
     with patch.object(
         climdata._examples, "get_versions", return_value={"version": "4.2.0+10.8dl8dh9"}
     ):
@@ -132,12 +149,33 @@ def test_get_data_version():
 )
 @patch("pooch.core.Pooch", autospec=True)
 @patch.object(climdata._examples, "get_versions", return_value={"version": "4.2.0"})
-def test_fetch_formatted_example_dataset(_, mock_pooch):
-    """Test the _fetch_formatted_example_dataset method."""
+@pytest.mark.parametrize("force_redownload", [False, True])
+def test_fetch_formatted_example_dataset(_, mock_pooch, force_redownload):
+    """
+    Test the _fetch_formatted_example_dataset method.
+
+    Files should always be fetched by pooch (which checks the hashes of any existing
+    files), with existing files only deleted beforehand if a redownload is forced.
+    """
     name = "leave"
     data_dir = "not/a/real/dir"
 
-    climdata._examples._fetch_formatted_example_dataset(name, data_dir)
+    with patch("pathlib.Path.unlink", autospec=True) as mock_unlink:
+        climdata._examples._fetch_formatted_example_dataset(
+            name, data_dir, force_redownload=force_redownload
+        )
+    if force_redownload:
+        assert sorted(
+            call.args[0].as_posix() for call in mock_unlink.call_args_list
+        ) == [
+            data_dir + "/lens2_ball_2015_cover_full_root_1.nc",
+            data_dir + "/lens2_ball_2015_cover_full_root_2.nc",
+        ]
+        assert all(
+            call.kwargs == {"missing_ok": True} for call in mock_unlink.call_args_list
+        )
+    else:
+        mock_unlink.assert_not_called()
     mock_pooch.assert_called_once()
     assert mock_pooch.call_args.kwargs["base_url"] == (
         "https://github.com/will-s-hart/climate-epidemics/"
@@ -152,11 +190,46 @@ def test_fetch_formatted_example_dataset(_, mock_pooch):
     )
     assert mock_pooch.return_value.fetch.call_count == 2
     mock_pooch.return_value.fetch.assert_any_call(
-        "lens2_ball_2015_cover_full_root_1.nc"
+        "lens2_ball_2015_cover_full_root_1.nc",
+        downloader=climdata._examples._download_with_shared_session,
     )
     mock_pooch.return_value.fetch.assert_any_call(
-        "lens2_ball_2015_cover_full_root_2.nc"
+        "lens2_ball_2015_cover_full_root_2.nc",
+        downloader=climdata._examples._download_with_shared_session,
+    )
+
+
+def test_get_requests_session():
+    """Test that _get_requests_session returns a single shared session."""
+    climdata._examples._get_requests_session.cache_clear()
+    session = climdata._examples._get_requests_session()
+    assert climdata._examples._get_requests_session() is session
+    adapter = session.get_adapter("https://github.com")
+    assert adapter.max_retries.total == 3
+    climdata._examples._get_requests_session.cache_clear()
+
+
+@patch.object(climdata._examples, "_get_requests_session")
+@pytest.mark.parametrize("to_path", [True, False])
+def test_download_with_shared_session(mock_get_requests_session, to_path, tmp_path):
+    """Test the _download_with_shared_session method."""
+    mock_response = mock_get_requests_session.return_value.get.return_value
+    mock_response.iter_content.return_value = [b"howzat", b"", b"!"]
+    output_path = tmp_path / "umpire.nc"
+    if to_path:
+        climdata._examples._download_with_shared_session(
+            "https://not/a/real/url", str(output_path), None
+        )
+    else:
+        with open(output_path, "w+b") as output_file:
+            climdata._examples._download_with_shared_session(
+                "https://not/a/real/url", output_file, None
+            )
+    mock_get_requests_session.return_value.get.assert_called_once_with(
+        "https://not/a/real/url", stream=True, timeout=60
     )
+    mock_response.raise_for_status.assert_called_once()
+    assert output_path.read_bytes() == b"howzat!"
 
 
 @patch.dict(
@@ -6,15 +6,16 @@ The ISIMIPDataGetter class is tested.
 
 import itertools
 import pathlib
-import time
 import types
-from unittest.mock import patch
+import zipfile
+from unittest.mock import MagicMock, Mock, create_autospec
 
 import numpy as np
 import numpy.testing as npt
 import pandas as pd
 import pooch
 import pytest
+import requests
 import xarray as xr
 import xarray.testing as xrt
 
@@ -23,6 +24,78 @@ from climepi.climdata._isimip import ISIMIPDataGetter
 from climepi.testing.fixtures import generate_dataset
 
 
+# Mocks of the requests session and geocode function (plain mocks restricted to the
+# attributes used suffice, avoiding the cost of autospeccing)
+
+
+@pytest.fixture
+def mock_session(monkeypatch):
+    """Mock requests.Session."""
+    mock_session_class = Mock(return_value=Mock(spec=["mount", "get", "post", "close"]))
+    monkeypatch.setattr(requests, "Session", mock_session_class)
+    return mock_session_class
+
+
+@pytest.fixture
+def mock_isimip_session(mock_session):
+    """
+    Mock requests.Session, simulating responses from the ISIMIP APIs.
+
+    Returns a namespace whose attributes configure the responses: GET requests return
+    search results paginated by model (one page per entry of ``model_pages``, each with
+    a result for every (start year, end year) pair in ``year_ranges``), and POST
+    requests return the id and status of a subsetting job (with the status "finished"
+    if calling ``job_finished`` returns True, and "waiting" otherwise). The mocked
+    session instance is stored in the ``session`` attribute.
+    """
+    config = types.SimpleNamespace(
+        session=mock_session.return_value,
+        model_pages=[],
+        year_ranges=[],
+        job_finished=lambda: True,
+    )
+
+    def mock_get_json():
+        url = config.session.get.call_args[0][0]
+        if url == "https://data.isimip.org/api/v1/files/":
+            page = 0
+        else:
+            page = int(url.removeprefix("fake_url_"))
+        next_ = f"fake_url_{page + 1}" if page + 1 < len(config.model_pages) else None
+        return {
+            "results": [
+                {
+                    "specifiers": {
+                        "model": config.model_pages[page],
+                        "start_year": start_year,
+                        "end_year": end_year,
+                    }
+                }
+                for start_year, end_year in config.year_ranges
+            ],
+            "next": next_,
+        }
+
+    def mock_post_json():
+        paths = config.session.post.call_args[1]["json"]["paths"]
+        bbox = config.session.post.call_args[1]["json"]["bbox"]
+        id_ = f"{paths[0]}_to_{paths[-1]}_bbox_{bbox[0]}_{bbox[1]}_{bbox[2]}_{bbox[3]}"
+        status = "finished" if config.job_finished() else "waiting"
+        return {"id": id_, "status": status}
+
+    config.session.get.return_value.json = mock_get_json
+    config.session.post.return_value.json = mock_post_json
+    return config
+
+
+@pytest.fixture
+def mock_geocode(monkeypatch):
+    """Mock the geocode function used in the _isimip module."""
+    mock_geocode_function = Mock()
+    monkeypatch.setattr(climepi.climdata._isimip, "geocode", mock_geocode_function)
+    return mock_geocode_function
+
+
 def test_init():
     """Test the __init__ method of the ISIMIPDataGetter class."""
     data_getter = ISIMIPDataGetter(
@@ -57,41 +130,18 @@ def test_init():
         assert getattr(data_getter, attr) == value, f"Attribute {attr} is not {value}."
 
 
-@patch("requests.Session", autospec=True)
-def test_find_remote_data(mock_session):
+def test_find_remote_data(mock_isimip_session):
     """Test the _find_remote_data method of the ISIMIPDataGetter class."""
-    # Set up mock methods
-
-    def mock_json():
-        if (
-            mock_session.return_value.get.call_args[0][0]
-            == "https://data.isimip.org/api/v1/files/"
-        ):
-            model = "mri-esm2-0"
-            next_ = "fake_url"
-        elif mock_session.return_value.get.call_args[0][0] == "fake_url":
-            model = "ukesm1-0-ll"
-            next_ = None
-        response = {
-            "results": [
-                {
-                    "specifiers": {
-                        "model": model,
-                        "start_year": start_year,
-                        "end_year": end_year,
-                    }
-                }
-                for start_year, end_year in zip(
-                    [2015, 2021, 2031, 2041, 2051],
-                    [2020, 2030, 2040, 2050, 2060],
-                    strict=True,
-                )
-            ],
-            "next": next_,
-        }
-        return response
-
-    mock_session.return_value.get.return_value.json = mock_json
+    # Set up mock responses
+
+    mock_isimip_session.model_pages = ["mri-esm2-0", "ukesm1-0-ll"]
+    mock_isimip_session.year_ranges = [
+        (2015, 2020),
+        (2021, 2030),
+        (2031, 2040),
+        (2041, 2050),
+        (2051, 2060),
+    ]
 
     # Set up DataGetter and run _find_remote_data
 
@@ -120,20 +170,31 @@ def test_find_remote_data(mock_session):
     ]
 
 
-@patch("requests.Session", autospec=True)
-@patch.object(climepi.climdata._isimip, "geocode", autospec=True)
 @pytest.mark.parametrize(
-    "location_mode",
-    ["single_named", "multiple_named", "grid_lon_0_360", "grid_lon_180_180", "global"],
+    "location_mode,times_out",
+    [
+        ("single_named", False),
+        ("multiple_named", False),
+        ("grid_lon_0_360", False),
+        ("grid_lon_180_180", False),
+        ("global", False),
+        # Timeouts are handled differently for multiple locations than otherwise (the
+        # location mode does not otherwise affect the timeout logic)
+        ("single_named", True),
+        ("multiple_named", True),
+    ],
 )
-@pytest.mark.parametrize("times_out", [False, True])
-def test_subset_remote_data(mock_geocode, mock_session, location_mode, times_out):
+def test_subset_remote_data(
+    mock_geocode, mock_isimip_session, location_mode, times_out, monkeypatch
+):
     """
     Test the _subset_remote_data method of the ISIMIPDataGetter class.
 
     Checks that the method correctly monitors the status of remote subsetting jobs.
     """
-    # Set up mock methods (including simulating a delay in the subsetting process)
+    # Set up mock methods (including simulating a delay in the subsetting process,
+    # using a fake clock that is advanced by calls to time.sleep so that the test does
+    # not need to wait in real time)
 
     subset_check_interval = 0.01
     max_subset_wait_time = 1
@@ -141,20 +202,18 @@ def test_subset_remote_data(mock_geocode, mock_session, location_mode, times_out
         time_to_finish = 2
     else:
         time_to_finish = 0.5
-    st = None  # start time to set below
+    fake_clock = {"time": 0.0}
 
-    def mock_json():
-        paths = mock_session.return_value.post.call_args[1]["json"]["paths"]
-        bbox = mock_session.return_value.post.call_args[1]["json"]["bbox"]
-        id_ = f"{paths[0]}_to_{paths[-1]}_bbox_{bbox[0]}_{bbox[1]}_{bbox[2]}_{bbox[3]}"
-        if time.time() - st > time_to_finish:
-            status = "finished"
-        else:
-            status = "waiting"
-        response = {"id": id_, "status": status}
-        return response
+    def mock_sleep(seconds):
+        fake_clock["time"] += seconds
+
+    monkeypatch.setattr(
+        climepi.climdata._isimip,
+        "time",
+        types.SimpleNamespace(time=lambda: fake_clock["time"], sleep=mock_sleep),
+    )
 
-    mock_session.return_value.post.return_value.json = mock_json
+    mock_isimip_session.job_finished = lambda: fake_clock["time"] > time_to_finish
 
     def _mock_geocode(location):
         if location == "Los Angeles":
@@ -223,7 +282,6 @@ def test_subset_remote_data(mock_geocode, mock_session, location_mode, times_out
         for bbox in bbox_expected_list
         for x, y in zip([0, 300, 600, 900], [299, 599, 899, 999], strict=True)
     ]
-    st = time.time()
     if times_out:
         if location_mode == "multiple_named":
             match = "Subsetting for at least one location timed out."
@@ -242,19 +300,24 @@ def test_subset_remote_data(mock_geocode, mock_session, location_mode, times_out
     # Check that requests sessions are closed
 
     if location_mode == "multiple_named":
-        assert mock_session.return_value.close.call_count == 2
+        assert mock_isimip_session.session.close.call_count == 2
     else:
-        mock_session.return_value.close.assert_called_once()
+        mock_isimip_session.session.close.assert_called_once()
 
 
-@patch.object(pooch, "retrieve", autospec=True)
-@patch.object(pathlib.Path, "unlink", autospec=True)
-@patch("zipfile.ZipFile", autospec=True)
 @pytest.mark.parametrize("data_subsetted", [False, True])
-def test_download_remote_data(mock_zipfile, mock_unlink, mock_retrieve, data_subsetted):
+def test_download_remote_data(data_subsetted, monkeypatch):
     """Test the _download_remote_data method of the ISIMIPDataGetter class."""
     # Set up mock methods
 
+    mock_retrieve = Mock()
+    # (autospec needed so that the mock is bound to the path it is called on)
+    mock_unlink = create_autospec(pathlib.Path.unlink)
+    mock_zipfile = MagicMock()  # MagicMock supports use as a context manager
+    monkeypatch.setattr(pooch, "retrieve", mock_retrieve)
+    monkeypatch.setattr(pathlib.Path, "unlink", mock_unlink)
+    monkeypatch.setattr(zipfile, "ZipFile", mock_zipfile)
+
     def mock_namelist():
         zip_file_name = str(mock_zipfile.call_args[0][0].as_posix()).rsplit(
             "/", maxsplit=1
@@ -323,8 +386,31 @@ def test_download_remote_data(mock_zipfile, mock_unlink, mock_retrieve, data_sub
         mock_unlink.assert_not_called()
 
 
-@patch.object(xr, "open_mfdataset", autospec=True)
-def test_open_temp_data(mock_open_mfdataset):
+@pytest.fixture(scope="module")
+def ds_open_temp_data_in():
+    """Input dataset for test_open_temp_data (read-only, shared between tests)."""
+    data_vars = ["tas", "pr"]
+    ds_in = generate_dataset(
+        data_var=data_vars,
+        extra_dims={
+            "scenario": ["overcast", "sunny"],
+            "model": ["bouncer", "inswinger", "length"],
+            "realization": [0],
+        },
+        frequency="daily",
+        has_bounds=False,
+    ).isel(lon=0, lat=0, drop=True)
+    for i, var in enumerate(data_vars):
+        # Distinct (deterministic) values for each variable
+        size = ds_in[var].size
+        ds_in[var].values = np.arange(i * size, (i + 1) * size, dtype=float).reshape(
+            ds_in[var].shape
+        )
+        ds_in[var].values.flags.writeable = False
+    return ds_in
+
+
+def test_open_temp_data(ds_open_temp_data_in, monkeypatch):
     """
     Test the _open_temp_data method of the ISIMIPDataGetter class.
 
@@ -333,46 +419,43 @@ def test_open_temp_data(mock_open_mfdataset):
     # Set up mock open_mfdataset method (which subsets, preprocesses and combines an
     # input dataset to simulate the opening of multiple files)
 
-    scenarios = ["overcast", "sunny"]
-    models = ["bouncer", "inswinger", "length"]
-    data_vars = ["tas", "pr"]
+    ds_in = ds_open_temp_data_in
+    scenarios = ds_in["scenario"].values.tolist()
+    models = ds_in["model"].values.tolist()
+    data_vars = list(ds_in.data_vars)
     time_subsets = [  # split to test fix for some times not centered in middle of day
         "times1",
         "times2",
     ]
-    ds_in = generate_dataset(
-        data_var=data_vars,
-        extra_dims={
-            "scenario": scenarios,
-            "model": models,
-            "realization": [0],
-        },
-        frequency="daily",
-        has_bounds=False,
-    ).isel(lon=0, lat=0, drop=True)
-    for var in data_vars:
-        ds_in[var].values = np.random.rand(*ds_in[var].shape)
+
+    temp_save_dir = pathlib.Path("cover")
+    spec_by_path = {
+        (
+            temp_save_dir / f"{model}_r1i1p1f1_w5e5_{scenario}_{var}_{time_subset}.nc"
+        ).as_posix(): (scenario, model, var, time_subset)
+        for scenario, model, var, time_subset in itertools.product(
+            scenarios, models, data_vars, time_subsets
+        )
+    }
+    time_slices = {"times1": slice(None, 3), "times2": slice(3, None)}
+    ds_in_by_spec = {
+        (scenario, model, var, time_subset): ds_in[[var]]
+        .sel(scenario=scenario, model=model, realization=0, drop=True)
+        .isel(time=time_slices[time_subset])
+        for scenario, model, var, time_subset in itertools.product(
+            scenarios, models, data_vars, time_subsets
+        )
+    }
 
     def mock_open_mfdataset_side_effect(paths, **kwargs):
+        assert len(paths) == len(spec_by_path)
         ds_list = []
-        for (scenario, model, var, time_subset), path in zip(
-            itertools.product(scenarios, models, data_vars, time_subsets),
-            paths,
-            strict=True,
-        ):
+        for path in paths:
             path = str(path.as_posix())
-            assert scenario in path
-            assert model in path
-            assert var in path
-            assert time_subset in path
-            ds_curr_init = ds_in[[var]].sel(
-                scenario=scenario, model=model, realization=0, drop=True
-            )
-            if time_subset == "times1":
-                ds_curr_init = ds_curr_init.isel(time=slice(None, 3))
-            else:
-                ds_curr_init = ds_curr_init.isel(time=slice(3, None))
-            if scenario == "overcast":
+            spec = spec_by_path[path]
+            # Shallow copy, since the time coordinate and encoding may be modified
+            ds_curr_init = ds_in_by_spec[spec].copy()
+            if spec[0] == "overcast":  # scenario
                 ds_curr_init["time"] = ds_curr_init["time"] - pd.Timedelta("12h")
                 ds_curr_init["time"].attrs = ds_in["time"].attrs
             ds_curr_init.encoding["source"] = path
@@ -380,18 +463,14 @@ def test_open_temp_data(mock_open_mfdataset):
             ds_list.append(ds_curr)
         return xr.combine_by_coords(ds_list)
 
-    mock_open_mfdataset.side_effect = mock_open_mfdataset_side_effect
+    mock_open_mfdataset = Mock(side_effect=mock_open_mfdataset_side_effect)
+    monkeypatch.setattr(xr, "open_mfdataset", mock_open_mfdataset)
 
     # Set up DataGetter and run _open_temp_data
 
     data_getter = ISIMIPDataGetter(subset={"scenarios": scenarios, "models": models})
-    data_getter._temp_file_names = [
-        f"{model}_r1i1p1f1_w5e5_{scenario}_{var}_{time_subset}.nc"
-        for scenario, model, var, time_subset in itertools.product(
-            scenarios, models, data_vars, time_subsets
-        )
-    ]
-    data_getter._temp_save_dir = pathlib.Path("cover")
+    data_getter._temp_file_names = [pathlib.Path(path).name for path in spec_by_path]
+    data_getter._temp_save_dir = temp_save_dir
 
     data_getter._open_temp_data()
 
@@ -401,28 +480,40 @@ def test_open_temp_data(mock_open_mfdataset):
     xrt.assert_identical(data_getter._ds, ds_in)
 
 
-@pytest.mark.parametrize("frequency", ["daily", "monthly", "yearly"])
-def test_process_data(frequency):
-    """Test the _process_data method of the ISIMIPDataGetter class."""
-    # Set up unprocessed dataset
-
+@pytest.fixture(scope="module")
+def time_bnds_process_data_in():
+    """Daily (noleap calendar) time bounds for test_process_data, built once."""
     time_lb = xr.cftime_range(
         start="2015-01-01", periods=730, freq="D", calendar="noleap"
     )
     time_rb = xr.cftime_range(
         start="2015-01-02", periods=730, freq="D", calendar="noleap"
     )
-    time_bnds_in = xr.DataArray(  # not in unprocessed dataset
-        np.array([time_lb, time_rb]).T,
+    time_bnds = xr.DataArray(
+        np.stack([np.asarray(time_lb), np.asarray(time_rb)], axis=1),
         dims=("time", "bnds"),
         attrs={"xcdat_bounds": True},
     )
-    time_in = time_bnds_in.mean(dim="bnds").assign_attrs(bounds="time_bnds")
+    return time_bnds
+
+
+@pytest.fixture(scope="module")
+def ds_process_data_in(time_bnds_process_data_in):
+    """Unprocessed dataset for test_process_data, shared between frequencies."""
+    time_in = time_bnds_process_data_in.mean(dim="bnds").assign_attrs(
+        bounds="time_bnds"
+    )
     time_in.encoding = {"calendar": "noleap", "units": "days since 2000-01-01"}
     ds_unprocessed = xr.Dataset(
         data_vars={
-            "tas": xr.DataArray(np.random.rand(730, 2, 2), dims=["time", "lat", "lon"]),
-            "pr": xr.DataArray(np.random.rand(730, 2, 2), dims=["time", "lat", "lon"]),
+            "tas": xr.DataArray(
+                np.arange(730 * 4, dtype=float).reshape(730, 2, 2),
+                dims=["time", "lat", "lon"],
+            ),
+            "pr": xr.DataArray(
+                np.arange(730 * 4, dtype=float).reshape(730, 2, 2) / 1e5,
+                dims=["time", "lat", "lon"],
+            ),
         },
         coords={
             "time": time_in,
@@ -430,20 +521,23 @@ def test_process_data(frequency):
             "lon": xr.DataArray([0, 150], dims="lon"),
         },
     )
+    return ds_unprocessed
 
-    # Set up DataGetter and run _process_data
 
-    locations = ["Brisbane"]
+def _run_process_data(frequency, ds_unprocessed):
+    # Run the _process_data method of an ISIMIPDataGetter on a (shallow copy of) an
+    # unprocessed dataset, returning the processed dataset.
     data_getter = ISIMIPDataGetter(
         frequency=frequency,
-        subset={"locations": locations},
+        subset={"locations": ["Brisbane"]},
     )
-    data_getter._ds = ds_unprocessed
+    data_getter._ds = ds_unprocessed.copy()
     data_getter._process_data()
-    ds_processed = data_getter._ds
+    return data_getter._ds
 
-    # Check processed dataset
 
+def _assert_common_post_process(ds_processed):
+    # Check properties of the processed dataset that do not depend on the frequency.
     npt.assert_allclose(ds_processed.lon.values.squeeze(), [150])
     npt.assert_allclose(ds_processed.lat.values.squeeze(), [-27])
     npt.assert_allclose(
@@ -461,25 +555,39 @@ def test_process_data(frequency):
     assert ds_processed.precipitation.attrs["units"] == "mm/day"
     assert ds_processed.time.attrs["long_name"] == "Time"
     assert ds_processed.time.attrs["bounds"] == "time_bnds"
-    if frequency == "daily":
-        xrt.assert_equal(
-            ds_processed["time_bnds"], time_bnds_in.assign_coords(time=time_in)
-        )
-        temperature_values_expected = (
-            ds_unprocessed["tas"].isel(lat=0, lon=1).values - 273.15
-        ).squeeze()
-        precipitation_values_expected = (
-            8.64e4 * ds_unprocessed["pr"].isel(lat=0, lon=1).values
-        ).squeeze()
-        npt.assert_allclose(
-            ds_processed.temperature.values.squeeze(), temperature_values_expected
-        )
-        npt.assert_allclose(
-            ds_processed.precipitation.values.squeeze(), precipitation_values_expected
-        )
-    elif frequency == "monthly":
-        assert ds_processed.time.size == 24
-    elif frequency == "yearly":
-        assert ds_processed.time.size == 2
-    else:
-        raise ValueError(f"Unexpected frequency {frequency}.")
+
+
+def test_process_data_daily(time_bnds_process_data_in, ds_process_data_in):
+    """Test the _process_data method of the ISIMIPDataGetter class (daily data)."""
+    ds_processed = _run_process_data("daily", ds_process_data_in)
+    _assert_common_post_process(ds_processed)
+    xrt.assert_equal(
+        ds_processed["time_bnds"],
+        time_bnds_process_data_in.assign_coords(time=ds_process_data_in["time"]),
+    )
+    temperature_values_expected = (
+        ds_process_data_in["tas"].isel(lat=0, lon=1).values - 273.15
+    ).squeeze()
+    precipitation_values_expected = (
+        8.64e4 * ds_process_data_in["pr"].isel(lat=0, lon=1).values
+    ).squeeze()
+    npt.assert_allclose(
+        ds_processed.temperature.values.squeeze(), temperature_values_expected
+    )
+    npt.assert_allclose(
+        ds_processed.precipitation.values.squeeze(), precipitation_values_expected
+    )
+
+
+def test_process_data_monthly(ds_process_data_in):
+    """Test the _process_data method of the ISIMIPDataGetter class (monthly data)."""
+    ds_processed = _run_process_data("monthly", ds_process_data_in)
+    _assert_common_post_process(ds_processed)
+    assert ds_processed.time.size == 24
+
+
+def test_process_data_yearly(ds_process_data_in):
+    """Test the _process_data method of the ISIMIPDataGetter class (yearly data)."""
+    ds_processed = _run_process_data("yearly", ds_process_data_in)
+    _assert_common_post_process(ds_processed)
+    assert ds_processed.time.size == 2
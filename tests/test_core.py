@@ -4,7 +4,10 @@ Unit tests for the _core module of the climepi package.
 The ClimEpiDatasetAccessor class is tested in this module.
 """
 
+import functools
+
 import cftime
+import dask
 import geoviews
 import hvplot.xarray  # noqa
 import numpy as np
@@ -16,17 +19,60 @@ from holoviews.element.comparison import Comparison as hvt
 from scipy.stats import norm
 
 from climepi import ClimEpiDatasetAccessor, epimod
-from climepi.testing.fixtures import generate_dataset
 
 
-def test__init__():
+# Random number generator used to generate test data (seeded for reproducibility)
+_RNG = np.random.default_rng(20240101)
+
+# Lengths and start indices of the months of 2001 (used to compute expected monthly
+# averages of daily time series for that year)
+MONTH_LENGTHS_2001 = np.array([31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])
+MONTH_STARTS_2001 = np.cumsum(MONTH_LENGTHS_2001) - MONTH_LENGTHS_2001
+
+
+# Time ranges used in the tests (constructed lazily and cached, since creating cftime
+# objects is relatively slow)
+@functools.lru_cache(maxsize=None)
+def _get_cftime_range(start, periods, freq):
+    return xr.date_range(start=start, periods=periods, freq=freq, use_cftime=True)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_days_from_start(start, periods, freq):
+    days_from_start = cftime.date2num(
+        _get_cftime_range(start, periods, freq), f"days since {start}"
+    )
+    days_from_start.flags.writeable = False
+    return days_from_start
+
+
+# Expected time bounds (and centered time values) of monthly averages of a daily time
+# series for 2001
+MONTHLY_TIME_BNDS_2001 = xr.Dataset(
+    {
+        "time_bnds": (
+            ("time", "bnds"),
+            np.stack(
+                [
+                    np.asarray(_get_cftime_range("2001-01-01", 12, "MS")),
+                    np.asarray(_get_cftime_range("2001-02-01", 12, "MS")),
+                ],
+                axis=-1,
+            ),
+        ),
+    },
+)
+MONTHLY_TIME_BNDS_2001["time"] = MONTHLY_TIME_BNDS_2001["time_bnds"].mean(dim="bnds")
+
+
+def test__init__(cached_dataset):
     """Test the __init__ method of the ClimEpiDatasetAccessor class."""
-    ds = generate_dataset()
+    ds = cached_dataset(size="tiny", dtype="float32").copy(deep=False)
     accessor = ClimEpiDatasetAccessor(ds)
-    xrt.assert_identical(accessor._obj, ds)
+    assert accessor._obj is ds
 
 
-def test_run_epi_model():
+def test_run_epi_model(cached_dataset):
     """
     Test the run_epi_model method of the ClimEpiDatasetAccessor class.
 
@@ -34,11 +80,11 @@ def test_run_epi_model():
     class. The run method of the EpiModel class is tested in the test module for the
     epimod subpackage.
     """
-    ds = generate_dataset()
+    ds = cached_dataset(size="tiny", dtype="float32").copy(deep=False)
     epi_model = epimod.SuitabilityModel(temperature_range=(15, 20))
     result = ds.climepi.run_epi_model(epi_model)
     expected = epi_model.run(ds)
-    xrt.assert_identical(result, expected)
+    xrt.assert_equal(result, expected)
 
 
 class TestSelGeo:
@@ -56,7 +102,7 @@ class TestSelGeo:
         """
         ds1 = xr.Dataset(
             {
-                "hello": (("lat", "lon", "there"), np.random.rand(9, 72, 2)),
+                "hello": (("lat", "lon", "there"), _RNG.random((9, 72, 2))),
             },
             coords={"lat": np.arange(0, 90, 10), "lon": np.arange(-180, 180, 5)},
         )
@@ -84,27 +130,29 @@ class TestSelGeo:
             npt.assert_equal(result.lat.values, lat_expected)
             npt.assert_equal(result.lon.values, lon_expected)
             npt.assert_equal(result["location"].values, location)
+            lat_index = np.argmin(np.abs(ds["lat"].values - lat_expected))
+            lon_index = np.argmin(np.abs(ds["lon"].values - lon_expected))
             npt.assert_equal(
-                result["hello"].values,
-                ds["hello"].sel(lon=lon_expected, lat=lat_expected).values,
+                result["hello"].values, ds["hello"].values[lat_index, lon_index]
             )
 
     @pytest.mark.parametrize("location_list", [["Miami", "Cape Town"], ["Miami"]])
-    def test_sel_geo_location_list(self, location_list):
+    def test_sel_geo_location_list(self, location_list, cached_dataset):
         """Test with a list of locations."""
         ds = (
-            generate_dataset(data_var="beamer", extra_dims={"covers": 2})
+            cached_dataset(data_var="beamer", extra_dims={"covers": 2})
+            .copy(deep=False)
             .drop_vars(("lat_bnds", "lon_bnds"))
             .assign_coords(
                 lat=np.array([-90, -30, 30, 90]), lon=np.array([90, 120, 150, 180])
             )
         )
-        ds["beamer"].values = np.random.rand(*ds["beamer"].shape)
+        ds["beamer"].values = _RNG.random(ds["beamer"].shape)
         result = ds.climepi.sel_geo(location=location_list)
         assert "location" in result.dims
         npt.assert_equal(result["location"].values, location_list)
         assert "location" not in result["time_bnds"].dims
-        xrt.assert_identical(result["time_bnds"], ds["time_bnds"])
+        xrt.assert_equal(result["time_bnds"], ds["time_bnds"])
         for location in location_list:
             if location == "Miami":
                 # True lat = 25.8, lon = -80.2
@@ -120,31 +168,41 @@ class TestSelGeo:
             )
 
 
+@pytest.fixture(scope="module")
+def ds_daily_2001():
+    """Dataset with daily temperature values (0, 1, 2, ...) for the year 2001."""
+    time_lb = _get_cftime_range("2001-01-01", 365, "D")
+    time_rb = _get_cftime_range("2001-01-02", 365, "D")
+    time_bnds = xr.DataArray(
+        np.stack([np.asarray(time_lb), np.asarray(time_rb)], axis=-1),
+        dims=("time", "bnds"),
+    )
+    time = time_bnds.mean(dim="bnds")
+    ds = xr.Dataset(
+        {
+            "temperature": (("time"), np.arange(365)),
+            "time_bnds": time_bnds,
+        },
+        coords={"time": time},
+    )
+    ds.time.attrs.update(bounds="time_bnds")
+    ds["time"].encoding.update(calendar="standard")
+    return ds
+
+
 @pytest.mark.parametrize("frequency", ["yearly", "monthly", "daily"])
 class TestTemporalGroupAverage:
     """Class for testing the temporal_group_average method of ClimEpiDatasetAccessor."""
 
-    def test_temporal_group_average(self, frequency):
+    def test_temporal_group_average(self, frequency, ds_daily_2001):
         """
         Main test.
 
         Focuses on the centering of the time values (which is added to the underlying
         xcdat temporal.group_average method).
         """
-        time_lb = xr.cftime_range(start="2001-01-01", periods=365, freq="D")
-        time_rb = xr.cftime_range(start="2001-01-02", periods=365, freq="D")
-        time_bnds = xr.DataArray(np.array([time_lb, time_rb]).T, dims=("time", "bnds"))
-        time = time_bnds.mean(dim="bnds")
-        temperature_values_in = np.arange(365)
-        ds = xr.Dataset(
-            {
-                "temperature": (("time"), temperature_values_in),
-                "time_bnds": time_bnds,
-            },
-            coords={"time": time},
-        )
-        ds.time.attrs.update(bounds="time_bnds")
-        ds["time"].encoding.update(calendar="standard")
+        ds = ds_daily_2001
+        temperature_values_in = ds["temperature"].values
         result = ds.climepi.temporal_group_average(frequency=frequency)
         time_index_result = result.get_index("time")
         temperature_values_result = result.temperature.values
@@ -154,38 +212,11 @@ class TestTemporalGroupAverage:
             temperature_values_expected = np.array([np.mean(temperature_values_in)])
             time_index_expected = xr.cftime_range(start="2001-01-01", periods=1)
         elif frequency == "monthly":
-            temperature_values_expected = np.array(
-                [
-                    np.mean(
-                        temperature_values_in[month_start : month_start + month_length]
-                    )
-                    for month_start, month_length in zip(
-                        np.cumsum([0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30]),
-                        np.array([31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31]),
-                        strict=True,
-                    )
-                ]
-            )
-            ds_time_bnds_expected = xr.Dataset(
-                {
-                    "time_bnds": (
-                        ("time", "bnds"),
-                        np.array(
-                            [
-                                xr.cftime_range(
-                                    start="2001-01-01", periods=12, freq="MS"
-                                ),
-                                xr.cftime_range(
-                                    start="2001-02-01", periods=12, freq="MS"
-                                ),
-                            ]
-                        ).T,
-                    ),
-                },
-            )
-            ds_time_bnds_expected["time"] = ds_time_bnds_expected["time_bnds"].mean(
-                dim="bnds"
+            temperature_values_expected = (
+                np.add.reduceat(temperature_values_in, MONTH_STARTS_2001)
+                / MONTH_LENGTHS_2001
             )
+            ds_time_bnds_expected = MONTHLY_TIME_BNDS_2001
             time_index_expected = ds_time_bnds_expected.get_index("time")
         elif frequency == "daily":
             temperature_values_expected = temperature_values_in
@@ -201,23 +232,23 @@ class TestTemporalGroupAverage:
         else:
             assert "time_bnds" not in result
 
-    def test_temporal_group_average_varlist(self, frequency):
+    def test_temporal_group_average_varlist(self, frequency, cached_dataset):
         """Test with a list of data variables."""
         data_vars = ["temperature", "precipitation"]
-        ds = generate_dataset(data_var=data_vars)
+        ds = cached_dataset(data_var=data_vars).copy(deep=False)
         result = ds.climepi.temporal_group_average(frequency=frequency)
         for data_var in data_vars:
             expected = ds[[data_var, "time_bnds"]].climepi.temporal_group_average(
                 frequency=frequency
             )
-            xrt.assert_identical(result[data_var], expected[data_var])
+            xrt.assert_equal(result[data_var], expected[data_var])
 
-    def test_temporal_group_average_datatypes(self, frequency):
+    def test_temporal_group_average_datatypes(self, frequency, cached_dataset):
         """Test with different data types."""
-        ds_bool = generate_dataset(data_var="temperature", dtype=bool)
-        ds_int = ds_bool.copy()
+        ds_bool = cached_dataset(data_var="temperature", dtype=bool).copy(deep=False)
+        ds_int = ds_bool.copy(deep=False)
         ds_int["temperature"] = ds_int["temperature"].astype(int)
-        ds_float = ds_int.copy()
+        ds_float = ds_int.copy(deep=False)
         ds_float["temperature"] = ds_float["temperature"].astype(float)
         result_bool = ds_bool.climepi.temporal_group_average(frequency=frequency)
         result_int = ds_int.climepi.temporal_group_average(frequency=frequency)
@@ -226,7 +257,7 @@ class TestTemporalGroupAverage:
         xrt.assert_identical(result_bool, result_float)
 
 
-def test_yearly_average():
+def test_yearly_average(cached_dataset):
     """
     Test the yearly_average method of the ClimEpiDatasetAccessor class.
 
@@ -234,13 +265,13 @@ def test_yearly_average():
     test that this method returns the same result as calling temporal_group_average
     directly.
     """
-    ds = generate_dataset()
+    ds = cached_dataset(size="tiny", dtype="float32").copy(deep=False)
     result = ds.climepi.yearly_average()
     expected = ds.climepi.temporal_group_average(frequency="yearly")
-    xrt.assert_identical(result, expected)
+    xrt.assert_equal(result, expected)
 
 
-def test_monthly_average():
+def test_monthly_average(cached_dataset):
     """
     Test the monthly_average method of the ClimEpiDatasetAccessor class.
 
@@ -248,10 +279,10 @@ def test_monthly_average():
     test that this method returns the same result as calling temporal_group_average
     directly.
     """
-    ds = generate_dataset()
+    ds = cached_dataset(size="tiny", dtype="float32").copy(deep=False)
     result = ds.climepi.monthly_average()
     expected = ds.climepi.temporal_group_average(frequency="monthly")
-    xrt.assert_identical(result, expected)
+    xrt.assert_equal(result, expected)
 
 
 class TestMonthsSuitable:
@@ -259,11 +290,14 @@ class TestMonthsSuitable:
 
     def test_months_suitable(self):
         """Main test."""
-        time_lb = xr.cftime_range(start="2001-01-01", periods=24, freq="MS")
-        time_rb = xr.cftime_range(start="2001-02-01", periods=24, freq="MS")
-        time_bnds = xr.DataArray(np.array([time_lb, time_rb]).T, dims=("time", "bnds"))
+        time_lb = _get_cftime_range("2001-01-01", 24, "MS")
+        time_rb = _get_cftime_range("2001-02-01", 24, "MS")
+        time_bnds = xr.DataArray(
+            np.stack([np.asarray(time_lb), np.asarray(time_rb)], axis=-1),
+            dims=("time", "bnds"),
+        )
         time = time_bnds.mean(dim="bnds")
-        suitability_values_in = np.random.rand(24, 2)
+        suitability_values_in = _RNG.random((24, 2))
         ds = xr.Dataset(
             {
                 "suitability": (("time", "kenobi"), suitability_values_in),
@@ -276,11 +310,8 @@ class TestMonthsSuitable:
         suitability_threshold = 0.5
         result = ds.climepi.months_suitable(suitability_threshold=suitability_threshold)
         months_suitable_values_result = result.months_suitable.values
-        months_suitable_values_expected = np.array(
-            [
-                np.sum(suitability_values_in[:12, :] > suitability_threshold, axis=0),
-                np.sum(suitability_values_in[12:, :] > suitability_threshold, axis=0),
-            ]
+        months_suitable_values_expected = np.count_nonzero(
+            (suitability_values_in > suitability_threshold).reshape(2, 12, 2), axis=1
         )
         npt.assert_allclose(
             months_suitable_values_result, months_suitable_values_expected
@@ -290,13 +321,13 @@ class TestMonthsSuitable:
             == "Months where suitability > 0.5"
         )
 
-    def test_months_suitable_var_names(self):
+    def test_months_suitable_var_names(self, cached_dataset):
         """Test with different data variable names present in the dataset."""
         data_vars = ["suitability", "also_suitability", "temperature"]
-        ds = generate_dataset(data_var=data_vars)
-        ds["suitability"].values = np.random.rand(*ds["suitability"].shape)
+        ds = cached_dataset(data_var=data_vars).copy(deep=False)
+        ds["suitability"].values = _RNG.random(ds["suitability"].shape)
         ds["also_suitability"].values = ds["suitability"].values
-        ds["temperature"].values = np.random.rand(*ds["temperature"].shape)
+        ds["temperature"].values = _RNG.random(ds["temperature"].shape)
         suitability_threshold = 0.2
         result1 = ds.climepi.months_suitable(
             suitability_threshold=suitability_threshold
@@ -322,10 +353,85 @@ class TestMonthsSuitable:
             ].climepi.months_suitable(suitability_threshold=suitability_threshold)
 
 
+@pytest.fixture(scope="module", params=[False, True], ids=["numpy", "dask"])
+def ds_ensemble(cached_dataset, request):
+    """
+    Dataset with random temperature and precipitation data for an ensemble.
+
+    Parametrized to give both in-memory and dask-backed (chunked along the
+    realization dimension) datasets.
+    """
+    ds = cached_dataset(
+        data_var=["temperature", "precipitation"],
+        extra_dims={"realization": 12, "ouch": 4},
+        size="tiny",
+    ).copy(deep=False)
+    # Use a local generator so that the (shared) data do not depend on test order
+    rng = np.random.default_rng(1)
+    ds["temperature"].values = rng.random(ds["temperature"].shape)
+    # Use a (time-reversed) view of the temperature data for precipitation, so that
+    # the variables have different values without allocating a second array
+    ds["precipitation"].values = ds["temperature"].values[..., ::-1, :, :]
+    if request.param:
+        ds = ds.chunk({"realization": 3, "ouch": 2})
+    return ds
+
+
+@pytest.fixture(scope="module")
+def ensemble_stats_result(ds_ensemble):
+    """Temperature data and ensemble stats computed from them."""
+    ds = ds_ensemble.drop_vars("precipitation")
+    # Load the result so that it is computed only once if dask-backed (it is shared
+    # between the TestEnsembleStats tests)
+    return ds, ds.climepi.ensemble_stats(uncertainty_level=60).load()
+
+
+@pytest.fixture(scope="module")
+def expected_ensemble_stats(ds_ensemble):
+    """Compute the expected ensemble stats for the temperature data with numpy."""
+    da = ds_ensemble["temperature"]
+    values = da.values
+    axis = da.get_axis_num("realization")
+    lower, median, upper = np.quantile(values, [0.2, 0.5, 0.8], axis=axis)
+    return {
+        "mean": np.mean(values, axis=axis),
+        "std": np.std(values, axis=axis),
+        "var": np.var(values, axis=axis),
+        "median": median,
+        "min": np.min(values, axis=axis),
+        "max": np.max(values, axis=axis),
+        "lower": lower,
+        "upper": upper,
+    }
+
+
+@pytest.fixture(scope="module")
+def single_realization_datasets(cached_dataset):
+    """
+    Datasets containing a single realization.
+
+    The same data are stored without a realization coordinate, with a realization
+    dimension of length 1, and with a non-dimensional realization coordinate.
+    """
+    ds1 = cached_dataset(data_var="temperature", size="tiny").copy(deep=False)
+    # Use a local generator so that the (shared) data do not depend on test order
+    rng = np.random.default_rng(2)
+    ds1["temperature"].values = rng.random(ds1["temperature"].shape)
+    ds2 = ds1.copy(deep=False)
+    ds2["temperature"] = ds2["temperature"].expand_dims("realization")
+    ds3 = ds1.copy(deep=False)
+    ds3["realization"] = "googly"
+    ds3 = ds3.set_coords("realization")
+    return ds1, ds2, ds3
+
+
 class TestEnsembleStats:
     """Class for testing the ensemble_stats method of ClimEpiDatasetAccessor."""
 
-    def test_ensemble_stats(self):
+    @pytest.mark.parametrize(
+        "stat", ["mean", "std", "var", "median", "min", "max", "lower", "upper"]
+    )
+    def test_ensemble_stats(self, ensemble_stats_result, expected_ensemble_stats, stat):
         """
         Main test.
 
@@ -333,112 +439,117 @@ class TestEnsembleStats:
         realization dimension, test that the method works correctly with both chunked
         and non-chunked datasets.
         """
-        ds = generate_dataset(
-            data_var="temperature", extra_dims={"realization": 12, "ouch": 4}
-        )
-        ds["temperature"].values = np.random.rand(*ds["temperature"].shape)
-        result = ds.climepi.ensemble_stats(uncertainty_level=60)
-        xrt.assert_allclose(
-            result["temperature"].sel(stat="mean", drop=True),
-            ds["temperature"].mean(dim="realization"),
-        )
-        xrt.assert_allclose(
-            result["temperature"].sel(stat="std", drop=True),
-            ds["temperature"].std(dim="realization"),
-        )
-        xrt.assert_allclose(
-            result["temperature"].sel(stat="var", drop=True),
-            ds["temperature"].var(dim="realization"),
-        )
-        xrt.assert_allclose(
-            result["temperature"].sel(stat="median", drop=True),
-            ds["temperature"].median(dim="realization"),
-        )
-        xrt.assert_allclose(
-            result["temperature"].sel(stat="min", drop=True),
-            ds["temperature"].min(dim="realization"),
-        )
-        xrt.assert_allclose(
-            result["temperature"].sel(stat="max", drop=True),
-            ds["temperature"].max(dim="realization"),
-        )
-        xrt.assert_allclose(
-            result["temperature"].sel(stat="lower", drop=True),
-            ds["temperature"].quantile(0.2, dim="realization").drop_vars("quantile"),
-        )
-        xrt.assert_allclose(
-            result["temperature"].sel(stat="upper", drop=True),
-            ds["temperature"].quantile(0.8, dim="realization").drop_vars("quantile"),
+        ds, result = ensemble_stats_result
+        dims = [dim for dim in ds["temperature"].dims if dim != "realization"]
+        npt.assert_allclose(
+            result["temperature"].sel(stat=stat, drop=True).transpose(*dims).values,
+            expected_ensemble_stats[stat],
         )
+
+    def test_ensemble_stats_chunks(self, ds_ensemble):
+        """
+        Test the chunking of the result.
+
+        Dask-backed data should be rechunked to a single chunk along the realization
+        dimension, with the other dimensions chunked automatically (giving a single
+        chunk for each dimension of this small dataset), while in-memory data should
+        not be chunked.
+        """
+        ds = ds_ensemble.drop_vars("precipitation")
+        result = ds.climepi.ensemble_stats()
+        if ds.chunks:
+            for dim, chunks in zip(
+                result["temperature"].dims, result["temperature"].chunks, strict=True
+            ):
+                if dim != "stat":
+                    assert chunks == (result.sizes[dim],)
+        else:
+            assert not result.chunks
+
+    def test_ensemble_stats_bounds(self, ensemble_stats_result):
+        """Test that the coordinates and bounds are retained."""
+        ds, result = ensemble_stats_result
         xrt.assert_allclose(
             result[["lon", "lat", "time", "lon_bnds", "lat_bnds", "time_bnds"]],
             ds[["lon", "lat", "time", "lon_bnds", "lat_bnds", "time_bnds"]],
         )
 
-    def test_ensemble_stats_varlist(self):
+    def test_ensemble_stats_varlist(self, ds_ensemble):
         """Test with a list of data variables."""
         data_vars = ["temperature", "precipitation"]
-        ds = generate_dataset(data_var=data_vars, extra_dims={"realization": 3})
-        ds["temperature"].values = np.random.rand(*ds["temperature"].shape)
-        ds["precipitation"].values = np.random.rand(*ds["precipitation"].shape)
+        ds = ds_ensemble
         result = ds.climepi.ensemble_stats()
         for data_var in data_vars:
-            xrt.assert_allclose(
-                result[data_var],
-                ds[[data_var]].climepi.ensemble_stats()[data_var],
-            )
-            xrt.assert_allclose(
-                result[data_var],
-                ds.climepi.ensemble_stats(data_var)[data_var],
-            )
-
-    def test_ensemble_stats_single_realization(self):
+            expected = ds[[data_var]].climepi.ensemble_stats()[data_var]
+            xrt.assert_allclose(result[data_var], expected)
+            xrt.assert_allclose(ds.climepi.ensemble_stats(data_var)[data_var], expected)
+
+    @pytest.mark.parametrize("estimate_internal_variability", [True, False])
+    def test_ensemble_stats_single_realization(
+        self, single_realization_datasets, estimate_internal_variability
+    ):
         """
         Test with a single realization.
 
-        Uses the option to estimate internal variability (enabled by default; only
+        With the option to estimate internal variability (enabled by default), only
         tests that this gives the same result as the estimate_ensemble_stats method,
-        which is tested separately).
+        which is tested separately. Without it, checks that the ensemble statistics
+        reduce to the data values (or zero for the standard deviation and variance).
         """
-        ds1 = generate_dataset(data_var="temperature")
-        ds1["temperature"].values = np.random.rand(*ds1["temperature"].shape)
-        ds2 = ds1.copy()
-        ds2["temperature"] = ds2["temperature"].expand_dims("realization")
-        ds3 = ds1.copy()
-        ds3["realization"] = "googly"
-        ds3 = ds3.set_coords("realization")
-        result1 = ds1.climepi.ensemble_stats()
-        result2 = ds2.climepi.ensemble_stats()
-        result3 = ds3.climepi.ensemble_stats()
-        expected = ds1.climepi.estimate_ensemble_stats()
-        xrt.assert_allclose(result1, expected)
-        xrt.assert_allclose(result2, expected)
-        xrt.assert_allclose(result3, expected)
-
-    def test_ensemble_stats_single_realization_no_estimation(self):
-        """Test with a single realization without estimating internal variability."""
-        ds1 = generate_dataset(data_var="temperature")
-        ds1["temperature"].values = np.random.rand(*ds1["temperature"].shape)
-        ds2 = ds1.copy()
-        ds2["temperature"] = ds2["temperature"].expand_dims("realization")
-        ds3 = ds1.copy()
-        ds3["realization"] = "googly"
-        ds3 = ds3.set_coords("realization")
-        result1 = ds1.climepi.ensemble_stats(estimate_internal_variability=False)
-        result2 = ds2.climepi.ensemble_stats(estimate_internal_variability=False)
-        result3 = ds3.climepi.ensemble_stats(estimate_internal_variability=False)
+        ds1, ds2, ds3 = single_realization_datasets
+        result1, result2, result3 = (
+            ds.climepi.ensemble_stats(
+                estimate_internal_variability=estimate_internal_variability
+            )
+            for ds in (ds1, ds2, ds3)
+        )
         xrt.assert_allclose(result1, result2)
         xrt.assert_allclose(result1, result3)
-        for stat in ["mean", "median", "min", "max", "lower", "upper"]:
-            xrt.assert_allclose(
-                result1["temperature"].sel(stat=stat, drop=True),
-                ds1["temperature"],
-            )
-        for stat in ["std", "var"]:
-            npt.assert_allclose(
-                result1["temperature"].sel(stat=stat, drop=True).values,
-                0,
-            )
+        if estimate_internal_variability:
+            xrt.assert_allclose(result1, ds1.climepi.estimate_ensemble_stats())
+        else:
+            for stat in ["mean", "median", "min", "max", "lower", "upper"]:
+                xrt.assert_allclose(
+                    result1["temperature"].sel(stat=stat, drop=True),
+                    ds1["temperature"],
+                )
+            for stat in ["std", "var"]:
+                npt.assert_allclose(
+                    result1["temperature"].sel(stat=stat, drop=True).values,
+                    0,
+                )
+
+
+# Time series made up of normally distributed noise added to a cubic polynomial (used
+# to test the estimate_ensemble_stats method), with repeats stacked along a "repeat"
+# dimension
+POLYNOMIAL_NOISE_STD = 0.734
+
+
+def _get_polynomial_noise_mean(n_time):
+    days_from_start = _get_days_from_start("2001-01-01", n_time, "MS")
+    return (
+        0.0000000000123 * days_from_start**3
+        - 0.00000257 * days_from_start**2
+        - 0.326 * days_from_start
+        - 259.29
+    )
+
+
+def _generate_polynomial_noise_dataset(n_time, repeats):
+    rng = np.random.default_rng(0)
+    temperature_values = (
+        rng.standard_normal((repeats, n_time)) * POLYNOMIAL_NOISE_STD
+        + _get_polynomial_noise_mean(n_time)[None, :]
+    )
+    ds = xr.Dataset(
+        {
+            "temperature": (("repeat", "time"), temperature_values),
+        },
+        coords={"time": _get_cftime_range("2001-01-01", n_time, "MS")},
+    )
+    ds["time"].encoding.update(calendar="standard")
+    return ds
 
 
 class TestEstimateEnsembleStats:
@@ -450,73 +561,70 @@ class TestEstimateEnsembleStats:
 
         This test is based on estimating ensemble stats from a temperature time series
         made up of normally distributed noise added to a polynomial (matching the
-        underlying assumptions of the estimate_ensemble_stats method). This is repeated
-        multiple times to ensure there is no systematic bias in the estimated ensemble
-        statistics.
+        underlying assumptions of the estimate_ensemble_stats method), and checks that
+        the results match those obtained by directly applying numpy's polynomial
+        fitting method.
         """
-        time = xr.cftime_range(start="2001-01-01", periods=10000, freq="MS")
-        days_from_start = cftime.date2num(time, "days since 2001-01-01")
-        mean_theoretical = (
-            0.0000000000123 * days_from_start**3
-            - 0.00000257 * days_from_start**2
-            - 0.326 * days_from_start
-            - 259.29
-        )
-        std_theoretical = 0.734
-        repeats = 100
-        mean_result_sum = np.zeros_like(mean_theoretical)
-        std_result_sum = np.zeros_like(mean_theoretical)
-        for repeat in range(repeats):
-            temperature_values_in = np.random.normal(
-                loc=mean_theoretical, scale=std_theoretical
-            )
-            ds = xr.Dataset(
-                {
-                    "temperature": ("time", temperature_values_in),
-                },
-                coords={"time": time},
-            )
-            ds["time"].encoding.update(calendar="standard")
-            result = ds.climepi.estimate_ensemble_stats(
-                uncertainty_level=80, polyfit_degree=3
-            )
-            if repeat == 0:
-                # Just check for the first repeat that the results match those obtained
-                # by directly applying numpy's polynomial fitting method.
-                polyfit_for_expected_values = np.polynomial.Polynomial.fit(
-                    days_from_start, temperature_values_in, 3, full=True
-                )
-                mean_expected = polyfit_for_expected_values[0](days_from_start)
-                var_expected = polyfit_for_expected_values[1][0][0] / len(
-                    days_from_start
-                )
-                std_expected = var_expected**0.5
-                lower_expected = norm.ppf(0.1, loc=mean_expected, scale=std_expected)
-                upper_expected = norm.ppf(0.9, loc=mean_expected, scale=std_expected)
-                npt.assert_allclose(
-                    result["temperature"].sel(stat="mean", drop=True).values,
-                    mean_expected,
-                )
-                npt.assert_allclose(
-                    result["temperature"].sel(stat="std", drop=True).values,
-                    std_expected,
-                )
-                npt.assert_allclose(
-                    result["temperature"].sel(stat="var", drop=True).values,
-                    var_expected,
-                )
-                npt.assert_allclose(
-                    result["temperature"].sel(stat="lower", drop=True).values,
-                    lower_expected,
-                )
-                npt.assert_allclose(
-                    result["temperature"].sel(stat="upper", drop=True).values,
-                    upper_expected,
-                )
-            mean_result_sum += result["temperature"].sel(stat="mean", drop=True).values
-            std_result_sum += result["temperature"].sel(stat="std", drop=True).values
-        mean_result_avg = mean_result_sum / repeats
-        std_result_avg = std_result_sum / repeats
+        n_time = 2000
+        ds = _generate_polynomial_noise_dataset(n_time, repeats=1).isel(repeat=0)
+        result = ds.climepi.estimate_ensemble_stats(
+            uncertainty_level=80, polyfit_degree=3
+        )
+        days_from_start = _get_days_from_start("2001-01-01", n_time, "MS")
+        polyfit_for_expected_values = np.polynomial.Polynomial.fit(
+            days_from_start, ds["temperature"].values, 3, full=True
+        )
+        mean_expected = polyfit_for_expected_values[0](days_from_start)
+        var_expected = polyfit_for_expected_values[1][0][0] / len(days_from_start)
+        std_expected = var_expected**0.5
+        lower_expected = norm.ppf(0.1, loc=mean_expected, scale=std_expected)
+        upper_expected = norm.ppf(0.9, loc=mean_expected, scale=std_expected)
+        npt.assert_allclose(
+            result["temperature"].sel(stat="mean", drop=True).values,
+            mean_expected,
+        )
+        npt.assert_allclose(
+            result["temperature"].sel(stat="std", drop=True).values,
+            std_expected,
+        )
+        npt.assert_allclose(
+            result["temperature"].sel(stat="var", drop=True).values,
+            var_expected,
+        )
+        npt.assert_allclose(
+            result["temperature"].sel(stat="lower", drop=True).values,
+            lower_expected,
+        )
+        npt.assert_allclose(
+            result["temperature"].sel(stat="upper", drop=True).values,
+            upper_expected,
+        )
+
+    @pytest.mark.slow
+    def test_estimate_ensemble_stats_unbiased(self, mc_size):
+        """
+        Test that there is no systematic bias in the estimated ensemble statistics.
+
+        Ensemble stats are estimated for multiple repeats of the time series used in
+        the main test (stacked along a "repeat" dimension so that they are estimated in
+        a single call), and the averages across repeats are compared with the
+        theoretical values (a fixed seed is used so that the tolerances used below are
+        met deterministically). The length of the time series and the number of repeats
+        are set by the --mc-size option.
+        """
+        n_time, repeats = mc_size
+        ds = _generate_polynomial_noise_dataset(n_time, repeats=repeats)
+        result = ds.climepi.estimate_ensemble_stats(
+            uncertainty_level=80, polyfit_degree=3
+        )
+        mean_theoretical = _get_polynomial_noise_mean(n_time)
+        std_theoretical = POLYNOMIAL_NOISE_STD
+        mean_result_avg = (
+            result["temperature"].sel(stat="mean", drop=True).mean("repeat").values
+        )
+        std_result_avg = (
+            result["temperature"].sel(stat="std", drop=True).mean("repeat").values
+        )
         var_result_avg = std_result_avg**2
         lower_result_avg = norm.ppf(0.1, loc=mean_result_avg, scale=std_result_avg)
         upper_result_avg = norm.ppf(0.9, loc=mean_result_avg, scale=std_result_avg)
@@ -550,12 +658,12 @@ class TestEstimateEnsembleStats:
             rtol=rtol_theoretical_match,
         )
 
-    def test_estimate_ensemble_stats_varlist(self):
+    def test_estimate_ensemble_stats_varlist(self, cached_dataset):
         """Test with a list of data variables."""
         data_vars = ["temperature", "precipitation"]
-        ds = generate_dataset(data_var=data_vars, frequency="monthly")
-        ds["temperature"].values = np.random.rand(*ds["temperature"].shape)
-        ds["precipitation"].values = np.random.rand(*ds["precipitation"].shape)
+        ds = cached_dataset(data_var=data_vars, frequency="monthly").copy(deep=False)
+        ds["temperature"].values = _RNG.random(ds["temperature"].shape)
+        ds["precipitation"].values = ds["temperature"].values[..., ::-1]
         result = ds.climepi.ensemble_stats()
         for data_var in data_vars:
             xrt.assert_allclose(
@@ -567,7 +675,7 @@ class TestEstimateEnsembleStats:
                 ds.climepi.ensemble_stats(data_var)[data_var],
             )
 
-    def test_estimate_ensemble_stats_contains_realization(self):
+    def test_estimate_ensemble_stats_contains_realization(self, cached_dataset):
         """
         Test with a dataset containing a realization dimension.
 
@@ -576,11 +684,13 @@ class TestEstimateEnsembleStats:
         coordinate, and raises an error when the realization dimension has length
         greater than 1.
         """
-        ds_base = generate_dataset(data_var="temperature", frequency="monthly")
-        ds_base["temperature"].values = np.random.rand(*ds_base["temperature"].shape)
-        ds1 = ds_base.copy()
+        ds_base = cached_dataset(data_var="temperature", frequency="monthly").copy(
+            deep=False
+        )
+        ds_base["temperature"].values = _RNG.random(ds_base["temperature"].shape)
+        ds1 = ds_base.copy(deep=False)
         ds1["temperature"] = ds1["temperature"].expand_dims("realization")
-        ds2 = ds_base.copy()
+        ds2 = ds_base.copy(deep=False)
         ds2["realization"] = "googly"
         ds2 = ds2.set_coords("realization")
         result1 = ds1.climepi.ensemble_stats()
@@ -588,8 +698,8 @@ class TestEstimateEnsembleStats:
         expected = ds_base.climepi.estimate_ensemble_stats()
         xrt.assert_allclose(result1, expected)
         xrt.assert_allclose(result2, expected)
-        ds3 = generate_dataset(extra_dims={"realization": 3})
-        ds3["temperature"].values = np.random.rand(*ds3["temperature"].shape)
+        ds3 = cached_dataset(extra_dims={"realization": 3}).copy(deep=False)
+        ds3["temperature"].values = _RNG.random(ds3["temperature"].shape)
         with pytest.raises(ValueError):
             ds3.climepi.estimate_ensemble_stats()
 
@@ -597,53 +707,99 @@ class TestEstimateEnsembleStats:
 class TestVarianceDecomposition:
     """Class for testing the variance_decomposition method of ClimEpiDatasetAccessor."""
 
-    def test_variance_decomposition(self):
-        """Main test."""
-        ds = generate_dataset(
+    @pytest.mark.parametrize("dtype", ["float64", "float32"])
+    @pytest.mark.parametrize("chunked", [False, True])
+    def test_variance_decomposition(self, cached_dataset, dtype, chunked):
+        """
+        Main test.
+
+        Checks in-memory and dask-backed data, in both double and single precision
+        (with tolerances relaxed accordingly for single precision).
+        """
+        ds = cached_dataset(
             data_var="temperature",
+            dtype=dtype,
             extra_dims={"scenario": 6, "model": 4, "realization": 9},
-        )
-        ds["temperature"].values = np.random.rand(*ds["temperature"].shape)
+        ).copy(deep=False)
+        ds["temperature"].values = _RNG.random(ds["temperature"].shape, dtype=dtype)
         ds["temperature"].attrs.update(
             units="Hello there", long_name="General Kenobi you are a bold one"
         )
+        if chunked:
+            # Chunk the dataset (with each chunk containing all realizations) so that
+            # the variance decomposition and expected values below are computed lazily,
+            # and then computed together in a single dask graph
+            ds = ds.chunk({"time": 1, "lat": -1, "lon": -1, "realization": -1})
         result = ds.climepi.variance_decomposition()
         result_fractional = ds.climepi.variance_decomposition(fraction=True)
         temperature_values = (
             ds["temperature"]
             .transpose("scenario", "model", "realization", "time", ...)
-            .values
+            .data
+        )
+        # Compute the expected variances from sums and sums of squares over realizations
+        # (so that the full array is only reduced once), with the model and scenario
+        # contributions computed from the (much smaller) realization means.
+        n_realization = temperature_values.shape[2]
+        n_total = n_realization * np.prod(temperature_values.shape[:2])
+        sum_realization = temperature_values.sum(axis=2)
+        sum_sq_realization = (temperature_values**2).sum(axis=2)
+        mean_realization = sum_realization / n_realization
+        var_total = (
+            sum_sq_realization.sum(axis=(0, 1)) / n_total
+            - (sum_realization.sum(axis=(0, 1)) / n_total) ** 2
+        )
+        var_internal = np.mean(
+            sum_sq_realization / n_realization - mean_realization**2, axis=(0, 1)
+        )
+        var_model = np.mean(np.var(mean_realization, axis=1), axis=0)
+        var_scenario = np.var(np.mean(mean_realization, axis=1), axis=0)
+        (
+            result,
+            result_fractional,
+            var_total,
+            var_internal,
+            var_model,
+            var_scenario,
+        ) = dask.compute(
+            result, result_fractional, var_total, var_internal, var_model, var_scenario
         )
-        var_total = np.var(temperature_values, axis=(0, 1, 2))
-        var_internal = np.mean(np.var(temperature_values, axis=2), axis=(0, 1))
-        var_model = np.mean(np.var(np.mean(temperature_values, axis=2), axis=1), axis=0)
-        var_scenario = np.var(np.mean(temperature_values, axis=(1, 2)), axis=0)
         var_frac_internal = var_internal / var_total
         var_frac_model = var_model / var_total
         var_frac_scenario = var_scenario / var_total
+        if dtype == "float32":
+            tol = {"rtol": 1e-5, "atol": 1e-6}
+        else:
+            tol = {"rtol": 1e-10, "atol": 1e-12}
         npt.assert_allclose(
             result["temperature"].sel(source="internal", drop=True).values,
             var_internal,
+            **tol,
         )
         npt.assert_allclose(
             result["temperature"].sel(source="model", drop=True).values,
             var_model,
+            **tol,
         )
         npt.assert_allclose(
             result["temperature"].sel(source="scenario", drop=True).values,
             var_scenario,
+            **tol,
         )
         npt.assert_allclose(
             result_fractional["temperature"].sel(source="internal", drop=True).values,
             var_frac_internal,
+            **tol,
         )
         npt.assert_allclose(
             result_fractional["temperature"].sel(source="model", drop=True).values,
             var_frac_model,
+            **tol,
         )
         npt.assert_allclose(
             result_fractional["temperature"].sel(source="scenario", drop=True).values,
             var_frac_scenario,
+            **tol,
         )
         assert result["temperature"].attrs["units"] == "(Hello there)²"
         assert (
@@ -660,12 +816,12 @@ class TestVarianceDecomposition:
             ds[["lon", "lat", "time", "lon_bnds", "lat_bnds", "time_bnds"]],
         )
 
-    def test_variance_decomposition_varlist(self):
+    def test_variance_decomposition_varlist(self, cached_dataset):
         """Test with a list of data variables."""
         data_vars = ["temperature", "precipitation"]
-        ds = generate_dataset(data_var=data_vars, frequency="monthly")
-        ds["temperature"].values = np.random.rand(*ds["temperature"].shape)
-        ds["precipitation"].values = np.random.rand(*ds["precipitation"].shape)
+        ds = cached_dataset(data_var=data_vars, frequency="monthly").copy(deep=False)
+        ds["temperature"].values = _RNG.random(ds["temperature"].shape)
+        ds["precipitation"].values = ds["temperature"].values[..., ::-1]
         result = ds.climepi.variance_decomposition()
         for data_var in data_vars:
             xrt.assert_allclose(
@@ -677,13 +833,15 @@ class TestVarianceDecomposition:
                 ds.climepi.variance_decomposition(data_var)[data_var],
             )
 
-    def test_variance_decomposition_single_scenario_model(self):
+    def test_variance_decomposition_single_scenario_model(self, cached_dataset):
         """Test with datasets containing a single scenario and model."""
-        ds1 = generate_dataset(data_var="temperature", extra_dims={"realization": 9})
-        ds1["temperature"].values = np.random.rand(*ds1["temperature"].shape)
-        ds2 = ds1.copy()
+        ds1 = cached_dataset(
+            data_var="temperature", extra_dims={"realization": 9}
+        ).copy(deep=False)
+        ds1["temperature"].values = _RNG.random(ds1["temperature"].shape)
+        ds2 = ds1.copy(deep=False)
         ds2["temperature"] = ds2["temperature"].expand_dims(["model", "scenario"])
-        ds3 = ds1.copy()
+        ds3 = ds1.copy(deep=False)
         ds3["model"] = "googly"
         ds3["scenario"] = "flipper"
         ds3 = ds3.set_coords(["model", "scenario"])
@@ -707,13 +865,17 @@ class TestVarianceDecomposition:
 class TestUncertaintyIntervalDecomposition:
     """Class for testing the uncertainty_interval_decomposition method."""
 
-    def test_uncertainty_interval_decomposition(self):
+    def test_uncertainty_interval_decomposition(self, cached_dataset):
         """Main test."""
-        ds = generate_dataset(
-            data_var="temperature",
-            extra_dims={"scenario": 6, "model": 4, "realization": 9},
-        ).isel(lon=0, lat=0)
-        ds["temperature"].values = np.random.rand(*ds["temperature"].shape)
+        ds = (
+            cached_dataset(
+                data_var="temperature",
+                extra_dims={"scenario": 6, "model": 4, "realization": 9},
+            )
+            .copy(deep=False)
+            .isel(lon=0, lat=0)
+        )
+        ds["temperature"].values = _RNG.random(ds["temperature"].shape)
         ds["temperature"] = (  # Make mean 0 at each time to simplify expected values
             ds["temperature"]
             - ds["temperature"].mean(dim=["scenario", "model", "realization"])
@@ -765,12 +927,12 @@ class TestUncertaintyIntervalDecomposition:
         assert result["temperature"].attrs == {"reverse": "sweep"}
         xrt.assert_identical(ds["time_bnds"], result["time_bnds"])
 
-    def test_uncertainty_interval_decomposition_varlist(self):
+    def test_uncertainty_interval_decomposition_varlist(self, cached_dataset):
         """Test with a list of data variables."""
         data_vars = ["temperature", "precipitation"]
-        ds = generate_dataset(data_var=data_vars, frequency="monthly")
-        ds["temperature"].values = np.random.rand(*ds["temperature"].shape)
-        ds["precipitation"].values = np.random.rand(*ds["precipitation"].shape)
+        ds = cached_dataset(data_var=data_vars, frequency="monthly").copy(deep=False)
+        ds["temperature"].values = _RNG.random(ds["temperature"].shape)
+        ds["precipitation"].values = ds["temperature"].values[..., ::-1]
         result = ds.climepi.uncertainty_interval_decomposition()
         for data_var in data_vars:
             xrt.assert_allclose(
@@ -782,13 +944,17 @@ class TestUncertaintyIntervalDecomposition:
                 ds.climepi.uncertainty_interval_decomposition(data_var)[data_var],
             )
 
-    def test_uncertainty_interval_decomposition_internal_only(self):
+    def test_uncertainty_interval_decomposition_internal_only(self, cached_dataset):
         """Test in case where only internal variability is present."""
-        ds = generate_dataset(
-            data_var="temperature",
-            extra_dims={"realization": 231},
-        ).isel(lon=0, lat=0)
-        ds["temperature"].values = np.random.rand(*ds["temperature"].shape)
+        ds = (
+            cached_dataset(
+                data_var="temperature",
+                extra_dims={"realization": 231},
+            )
+            .copy(deep=False)
+            .isel(lon=0, lat=0)
+        )
+        ds["temperature"].values = _RNG.random(ds["temperature"].shape)
         ds["temperature"] = (  # Make mean 0 at each time to simplify expected values
             ds["temperature"] - ds["temperature"].mean(dim="realization")
         )
@@ -826,13 +992,17 @@ class TestUncertaintyIntervalDecomposition:
             result.sel(level="internal_upper", drop=True),
         )
 
-    def test_uncertainty_interval_decomposition_model_only(self):
+    def test_uncertainty_interval_decomposition_model_only(self, cached_dataset):
         """Test with only model uncertainty (not estimating internal variability)."""
-        ds = generate_dataset(
-            data_var="temperature",
-            extra_dims={"model": 17},
-        ).isel(lon=0, lat=0)
-        ds["temperature"].values = np.random.rand(*ds["temperature"].shape)
+        ds = (
+            cached_dataset(
+                data_var="temperature",
+                extra_dims={"model": 17},
+            )
+            .copy(deep=False)
+            .isel(lon=0, lat=0)
+        )
+        ds["temperature"].values = _RNG.random(ds["temperature"].shape)
         ds["temperature"] = (  # Make mean 0 at each time to simplify expected values
             ds["temperature"] - ds["temperature"].mean(dim="model")
         )
@@ -864,13 +1034,17 @@ class TestUncertaintyIntervalDecomposition:
             result.sel(level="model_upper", drop=True),
         )
 
-    def test_uncertainty_interval_decomposition_scenario_only(self):
+    def test_uncertainty_interval_decomposition_scenario_only(self, cached_dataset):
         """Test with only scenario uncertainty (not estimating internal variability)."""
-        ds = generate_dataset(
-            data_var="temperature",
-            extra_dims={"scenario": 17},
-        ).isel(lon=0, lat=0)
-        ds["temperature"].values = np.random.rand(*ds["temperature"].shape)
+        ds = (
+            cached_dataset(
+                data_var="temperature",
+                extra_dims={"scenario": 17},
+            )
+            .copy(deep=False)
+            .isel(lon=0, lat=0)
+        )
+        ds["temperature"].values = _RNG.random(ds["temperature"].shape)
         ds["temperature"] = (  # Make mean 0 at each time to simplify expected values
             ds["temperature"] - ds["temperature"].mean(dim="scenario")
         )
@@ -897,41 +1071,43 @@ class TestUncertaintyIntervalDecomposition:
         npt.assert_allclose(result.sel(level="scenario_upper").values, upper_expected)
 
 
-def test_plot_time_series():
+def test_plot_time_series(cached_dataset):
     """
     Test the plot_time_series method of the ClimEpiDatasetAccessor class.
 
     Since this method is a thin wrapper around hvplot.line, only test that this method
     returns the same result as calling hvplot.line directly in a simple case.
     """
-    ds = generate_dataset(
+    ds = cached_dataset(
         data_var=["temperature", "precipitation"], extra_dims={"realization": 3}
-    )
-    ds["temperature"].values = np.random.rand(*ds["temperature"].shape)
-    ds["precipitation"].values = np.random.rand(*ds["precipitation"].shape)
+    ).copy(deep=False)
+    ds["temperature"].values = _RNG.random(ds["temperature"].shape)
+    ds["precipitation"].values = _RNG.random(ds["precipitation"].shape)
     kwargs = {"by": ["realization", "lat", "lon"]}
     result = ds.climepi.plot_time_series("precipitation", **kwargs)
     expected = ds["precipitation"].hvplot.line(x="time", **kwargs)
     hvt.assertEqual(result, expected)
 
 
-def test_plot_map():
+def test_plot_map(cached_dataset):
     """
     Test the plot_map method of the ClimEpiDatasetAccessor class.
 
     Since this method is a thin wrapper around hvplot.quadmesh, only test that this
     method returns the same result as calling hvplot.quadmesh directly in a simple case.
     """
-    ds = generate_dataset(
-        data_var=["temperature", "precipitation"], lon_0_360=False
-    ).isel(time=0)
-    ds["temperature"].values = np.random.rand(*ds["temperature"].shape)
+    ds = (
+        cached_dataset(data_var=["temperature", "precipitation"], lon_0_360=False)
+        .copy(deep=False)
+        .isel(time=0)
+    )
+    ds["temperature"].values = _RNG.random(ds["temperature"].shape)
     result = ds.climepi.plot_map("temperature", rasterize=False)
     quadmesh_expected = ds["temperature"].hvplot.quadmesh(
         x="lon",
         y="lat",
         cmap="viridis",
-        project=True,
+        project=False,
         geo=True,
         rasterize=False,
     )
@@ -941,13 +1117,17 @@ def test_plot_map():
 
 
 @pytest.mark.parametrize("fraction", [True, False])
-def test_plot_variance_decomposition(fraction):
+def test_plot_variance_decomposition(fraction, cached_dataset):
     """Test the plot_variance_decomposition method of the ClimEpiDatasetAccessor class."""
-    ds = generate_dataset(
-        data_var="temperature",
-        extra_dims={"scenario": 6, "model": 4, "realization": 9},
-    ).isel(lon=0, lat=0)
-    ds["temperature"].values = np.random.rand(*ds["temperature"].shape)
+    ds = (
+        cached_dataset(
+            data_var="temperature",
+            extra_dims={"scenario": 6, "model": 4, "realization": 9},
+        )
+        .copy(deep=False)
+        .isel(lon=0, lat=0)
+    )
+    ds["temperature"].values = _RNG.random(ds["temperature"].shape)
     ds["temperature"].attrs.update(units="there", long_name="Hello")
     result = ds.climepi.plot_variance_decomposition(fraction=fraction)
     # Test that lower/upper bounds for each component are correct
@@ -994,13 +1174,17 @@ def test_plot_variance_decomposition(fraction):
 class TestPlotUncertaintyIntervalDecomposition:
     """Class for testing the plot_uncertainty_decomposition method."""
 
-    def test_plot_uncertainty_interval_decomposition(self):
+    def test_plot_uncertainty_interval_decomposition(self, cached_dataset):
         """Main test."""
-        ds = generate_dataset(
-            data_var="temperature",
-            extra_dims={"scenario": 6, "model": 4, "realization": 9},
-        ).isel(lon=0, lat=0)
-        ds["temperature"].values = np.random.rand(*ds["temperature"].shape)
+        ds = (
+            cached_dataset(
+                data_var="temperature",
+                extra_dims={"scenario": 6, "model": 4, "realization": 9},
+            )
+            .copy(deep=False)
+            .isel(lon=0, lat=0)
+        )
+        ds["temperature"].values = _RNG.random(ds["temperature"].shape)
         result = ds.climepi.plot_uncertainty_interval_decomposition()
         assert list(result.data.keys()) == [
             ("Area", "Scenario_uncertainty"),
@@ -1057,25 +1241,35 @@ class TestPlotUncertaintyIntervalDecomposition:
             da_decomp.sel(level="scenario_upper"),
         )
 
-    def test_plot_uncertainty_interval_decomposition_internal_only(self):
+    def test_plot_uncertainty_interval_decomposition_internal_only(
+        self, cached_dataset
+    ):
         """Test in case where only internal variability is present."""
-        ds = generate_dataset(
-            data_var="temperature",
-            extra_dims={"realization": 231},
-        ).isel(lon=0, lat=0)
-        ds["temperature"].values = np.random.rand(*ds["temperature"].shape)
+        ds = (
+            cached_dataset(
+                data_var="temperature",
+                extra_dims={"realization": 231},
+            )
+            .copy(deep=False)
+            .isel(lon=0, lat=0)
+        )
+        ds["temperature"].values = _RNG.random(ds["temperature"].shape)
         result = ds.climepi.plot_uncertainty_interval_decomposition()
         assert list(result.data.keys()) == [
             ("Area", "Internal_variability"),
             ("Curve", "Mean"),
         ]
 
-    def test_plot_uncertainty_interval_decomposition_model_only(self):
+    def test_plot_uncertainty_interval_decomposition_model_only(self, cached_dataset):
         """Test with only model uncertainty (not estimating internal variability)."""
-        ds = generate_dataset(
-            data_var="temperature",
-            extra_dims={"model": 17},
-        ).isel(lon=0, lat=0)
+        ds = (
+            cached_dataset(
+                data_var="temperature",
+                extra_dims={"model": 17},
+            )
+            .copy(deep=False)
+            .isel(lon=0, lat=0)
+        )
         result = ds.climepi.plot_uncertainty_interval_decomposition(
             estimate_internal_variability=False
         )
@@ -1085,12 +1279,16 @@ class TestPlotUncertaintyIntervalDecomposition:
             ("Curve", "Mean"),
         ]
 
-    def test_plot_uncertainty_interval_decomposition_no_model(self):
+    def test_plot_uncertainty_interval_decomposition_no_model(self, cached_dataset):
         """Test with no model uncertainty, estimating internal variability."""
-        ds = generate_dataset(
-            data_var="temperature",
-            extra_dims={"scenario": 17},
-        ).isel(lon=0, lat=0)
+        ds = (
+            cached_dataset(
+                data_var="temperature",
+                extra_dims={"scenario": 17},
+            )
+            .copy(deep=False)
+            .isel(lon=0, lat=0)
+        )
         result = ds.climepi.plot_uncertainty_interval_decomposition()
         assert list(result.data.keys()) == [
             ("Area", "Scenario_uncertainty"),
@@ -1100,10 +1298,10 @@ class TestPlotUncertaintyIntervalDecomposition:
         ]
 
 
-def test__process_data_var_argument():
+def test__process_data_var_argument(cached_dataset):
     """Test the _process_data_var_argument method of ClimEpiDatasetAccessor."""
-    ds1 = generate_dataset(data_var="temperature")
-    ds2 = generate_dataset(data_var=["temperature", "precipitation"])
+    ds1 = cached_dataset(data_var="temperature").copy(deep=False)
+    ds2 = cached_dataset(data_var=["temperature", "precipitation"]).copy(deep=False)
     assert ds1.climepi._process_data_var_argument("temperature") == "temperature"
     assert ds1.climepi._process_data_var_argument(["temperature"], as_list=True) == [
         "temperature"
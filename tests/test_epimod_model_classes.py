@@ -99,6 +99,15 @@ class TestSuitabilityModel:
             ds_suitability[["lon_bnds", "lat_bnds", "time_bnds"]],
             ds_clim[["lon_bnds", "lat_bnds", "time_bnds"]],
         )
+        # Check that bounds stored as coordinates (rather than data variables) are also
+        # retained.
+        ds_suitability_bnds_coords = model.run(
+            ds_clim.set_coords(["lon_bnds", "lat_bnds", "time_bnds"])
+        )
+        xrt.assert_equal(
+            ds_suitability_bnds_coords[["lon_bnds", "lat_bnds", "time_bnds"]],
+            ds_clim[["lon_bnds", "lat_bnds", "time_bnds"]],
+        )
         # Check that running return_months_suitable=True gives the same result as
         # calculating months suitable from the suitability dataset.
         ds_months_suitable = model.run(ds_clim, return_months_suitable=True)
@@ -124,10 +133,21 @@ class TestSuitabilityModel:
             ds_suitability["hello"].values,
             suitability_values_expected,
         )
+        assert ds_suitability["hello"].dtype == np.float32
         assert ds_suitability["hello"].attrs == {
             "long_name": "Hello",
             "units": "there",
         }
+        # Check that binary temperature-only tables still give single-precision floats
+        # (since values are linearly interpolated between grid points).
+        suitability_table_binary = suitability_table.copy()
+        suitability_table_binary["hello"].values = [0, 1, 1]
+        model_binary = epimod.SuitabilityModel(
+            suitability_table=suitability_table_binary
+        )
+        ds_suitability_binary = model_binary.run(ds_clim)
+        assert ds_suitability_binary["hello"].dtype == np.float32
+        npt.assert_equal(ds_suitability_binary["hello"].values, [0, 1, 0.5, 1, 1])
 
     def test_run_temp_precip_table(self):
         """Test the run method with a temp/precip-dependent suitability table."""
@@ -155,21 +175,97 @@ class TestSuitabilityModel:
             }
         )
         ds_suitability = model.run(ds_clim)
-        suitability_values_expected = [0, 0.5, 0.25, 1, 0.25, 0.69]  # nearest neighbor
+        suitability_values_expected = np.array(  # nearest neighbor
+            [0, 0.5, 0.25, 1, 0.25, 0.69], dtype=np.float32
+        )
         npt.assert_equal(
             ds_suitability["suitability"].values,
             suitability_values_expected,
         )
+        assert ds_suitability["suitability"].dtype == np.float32
         assert ds_suitability["suitability"].attrs == {
             "long_name": "hello",
             "units": "kenobi",
         }
-        # Check that running with a suitability table with non-equally spaced
-        # temperature or precipitation values raises an error.
+        # Check that binary suitability values are returned as 8-bit integers.
+        suitability_table_binary = suitability_table.copy()
+        suitability_table_binary["suitability"].values = [[0, 1], [1, 1], [0, 0]]
+        model_binary = epimod.SuitabilityModel(
+            suitability_table=suitability_table_binary
+        )
+        ds_suitability_binary = model_binary.run(ds_clim)
+        assert ds_suitability_binary["suitability"].dtype == np.uint8
+        npt.assert_equal(
+            ds_suitability_binary["suitability"].values, [0, 1, 0, 1, 0, 0]
+        )
+        # Check that using a suitability table with non-equally spaced temperature or
+        # precipitation values raises an error.
         suitability_table1 = suitability_table.assign_coords(temperature=[0, 1, 1.5])
-        model1 = epimod.SuitabilityModel(suitability_table=suitability_table1)
         with pytest.raises(ValueError):
-            model1.run(ds_clim)
+            epimod.SuitabilityModel(suitability_table=suitability_table1)
+
+    def test_run_temp_precip_table_bilinear(self):
+        """Test the run method with bilinear interpolation of a temp/precip table."""
+        suitability_table = xr.Dataset(
+            {
+                "suitability": (
+                    ("temperature", "precipitation"),
+                    [[0, 0.5], [0.75, 1], [0.25, 0.69]],
+                ),
+            },
+            coords={
+                "temperature": [0, 1, 2],
+                "precipitation": [0, 1],
+            },
+        )
+        model = epimod.SuitabilityModel(
+            suitability_table=suitability_table, interp_order=1
+        )
+        assert model.interp_order == 1
+        ds_clim = xr.Dataset(
+            {
+                "temperature": ("general", [-0.3, 0, 1.5, 0.7, 2, 4]),
+                "precipitation": ("general", [-0.5, 1, 0.25, 0.75, 0.3, 0.8]),
+            }
+        )
+        ds_suitability = model.run(ds_clim)
+        suitability_values_expected = [0, 0.5, 0.58625, 0.76875, 0.382, 0.602]
+        npt.assert_allclose(
+            ds_suitability["suitability"].values,
+            suitability_values_expected,
+            rtol=1e-6,
+        )
+        assert ds_suitability["suitability"].dtype == np.float32
+        # Check that NaN temperature or precipitation values give NaN suitability.
+        ds_clim_nan = xr.Dataset(
+            {
+                "temperature": ("general", [np.nan, 1.5, 0.7]),
+                "precipitation": ("general", [0.5, np.nan, 0.75]),
+            }
+        )
+        npt.assert_allclose(
+            model.run(ds_clim_nan)["suitability"].values,
+            [np.nan, np.nan, 0.76875],
+            rtol=1e-6,
+        )
+        # Check that temperature and precipitation data with different dimensions are
+        # broadcast against each other.
+        ds_clim_broadcast = xr.Dataset(
+            {
+                "temperature": ("general", [0, 1.5]),
+                "precipitation": ("kenobi", [1, 0.25, 0.75]),
+            }
+        )
+        ds_suitability_broadcast = model.run(ds_clim_broadcast)
+        assert ds_suitability_broadcast["suitability"].dims == ("general", "kenobi")
+        npt.assert_allclose(
+            ds_suitability_broadcast["suitability"].values,
+            [[0.5, 0.125, 0.375], [0.845, 0.58625, 0.75875]],
+            rtol=1e-6,
+        )
+        # Check that an invalid interpolation order raises an error.
+        with pytest.raises(ValueError):
+            epimod.SuitabilityModel(suitability_table=suitability_table, interp_order=2)
 
     def test_plot_suitability_region_range(self):
         """Test the plot_suitability_region method with a temperature range."""
@@ -247,3 +343,16 @@ class TestSuitabilityModel:
         model = epimod.SuitabilityModel(suitability_table=suitability_table)
         result = model.get_max_suitability()
         npt.assert_equal(result, 3.5)
+
+
+def test_suitability_1d():
+    """Test the suitability_1d function."""
+    temperature = np.array([[-0.5, 1, 0.5], [1.75, 2.5, np.nan]])
+    # Equally spaced temperature values
+    result1 = epimod.suitability_1d(temperature, [0, 1, 2], [0, 0.5, 1])
+    npt.assert_equal(result1, [[0, 0.5, 0.25], [0.875, 1, np.nan]])
+    assert result1.dtype == np.float32
+    # Non-equally spaced temperature values
+    result2 = epimod.suitability_1d(temperature, [0, 1, 3], [0, 0.5, 1])
+    npt.assert_equal(result2, [[0, 0.5, 0.25], [0.6875, 0.875, np.nan]])
+    assert result2.dtype == np.float32
@@ -4,14 +4,16 @@ import importlib
 import logging
 import sys
 import types
-from unittest.mock import patch
 
 import climepi._xcdat
 
 
-def test_xesmf_import_error_handling(caplog):
+def test_xesmf_import_error_handling(caplog, monkeypatch):
     """Test that the _xcdat.py module correctly handles an ImportError for `xesmf`."""
-    sys.modules.pop("xesmf", None)
+    # Remove `xesmf` from sys.modules for the duration of the test (monkeypatch
+    # restores the original entry afterwards, so the module does not need to be
+    # reloaded again to undo the effects of the mocked import)
+    monkeypatch.delitem(sys.modules, "xesmf")
 
     def mock_importlib_import(name, *args, **kwargs):
         if name == "xesmf":
@@ -22,12 +24,11 @@ def test_xesmf_import_error_handling(caplog):
             "unexpected behavior."
         )
 
-    with patch.object(importlib, "import_module", mock_importlib_import):
+    with monkeypatch.context() as m:
+        m.setattr(importlib, "import_module", mock_importlib_import)
         with caplog.at_level(logging.WARNING):
             importlib.reload(climepi._xcdat)
 
     assert isinstance(sys.modules["xesmf"], types.ModuleType)
     assert sys.modules["xesmf"].Regridder is None
     assert "`xesmf` package could not be imported; using mocked version." in caplog.text
-
-    importlib.reload(climepi._xcdat)